@@ -0,0 +1,70 @@
+import numpy as np
+import streamlit as st
+
+AGGREGATE_COLUMNS = ['SalePrice', 'Gr Liv Area', 'Overall Qual']
+
+
+class RangeAggregates:
+    """Soma, contagem e média por faixa de preço/qualidade sem varrer os dados.
+
+    Usa a ordem do `PriceQualityIndex` (blocos por qualidade, preço ordenado
+    dentro do bloco): somas de prefixo nessa ordem transformam cada bloco
+    selecionado em uma subtração, então uma consulta custa O(níveis de
+    qualidade) buscas binárias. A mediana de preço usa os próprios blocos
+    ordenados do índice.
+    """
+
+    def __init__(self, index, df, columns=AGGREGATE_COLUMNS):
+        self.index = index
+        self.sums = {}
+        self.counts = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[index.positions]
+            valid = ~np.isnan(values)
+            self.sums[col] = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+            self.counts[col] = np.concatenate(([0], np.cumsum(valid)))
+        self.price_values = np.unique(index.prices)
+
+    def query(self, price_range, quality_range):
+        """Retorna {'count', 'sum', 'mean'} para cada coluna agregada."""
+        slices = self.index.bucket_slices(price_range, quality_range)
+        lo = np.array([s[0] for s in slices], dtype=np.intp)
+        hi = np.array([s[1] for s in slices], dtype=np.intp)
+        result = {'rows': int((hi - lo).sum())}
+        for col, prefix in self.sums.items():
+            count = int((self.counts[col][hi] - self.counts[col][lo]).sum())
+            total = float((prefix[hi] - prefix[lo]).sum())
+            result[col] = {'count': count, 'sum': total,
+                           'mean': total / count if count else float('nan')}
+        return result
+
+    def _rank_count(self, slices, value):
+        # Quantos preços selecionados são <= value
+        prices = self.index.prices
+        return sum(np.searchsorted(prices[lo:hi], value, side='right') for lo, hi in slices)
+
+    def _kth_price(self, slices, k):
+        lo, hi = 0, len(self.price_values) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._rank_count(slices, self.price_values[mid]) > k:
+                hi = mid
+            else:
+                lo = mid + 1
+        return float(self.price_values[lo])
+
+    def median_price(self, price_range, quality_range):
+        """Mediana de SalePrice por busca binária nos valores sobre os blocos ordenados."""
+        slices = self.index.bucket_slices(price_range, quality_range)
+        n = sum(hi - lo for lo, hi in slices)
+        if n == 0:
+            return float('nan')
+        middle = self._kth_price(slices, (n - 1) // 2)
+        if n % 2:
+            return middle
+        return (middle + self._kth_price(slices, n // 2)) / 2
+
+
+@st.cache_resource(show_spinner=False)
+def get_aggregates(data_version, _index, _df):
+    return RangeAggregates(_index, _df)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data import CATEGORICAL_COLUMNS
+from result_store import content_key, get_result_store
+
+TARGET = 'SalePrice'
+PRICE_QUARTILE = 'SalePrice (quartis)'
+# Identificadores não entram nas correlações
+ID_COLUMNS = ['Order', 'PID']
+
+
+def numeric_columns(df):
+    columns = [col for col in df.columns
+               if col not in ID_COLUMNS and col != TARGET
+               and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    # A variável-alvo fica na última linha
+    return columns + [TARGET]
+
+
+def spearman_matrix(df):
+    """Correlação de Spearman: cada coluna é ranqueada uma vez e a matriz sai de um único produto.
+
+    Valores ausentes recebem o posto médio (contribuição nula após centralizar).
+    """
+    columns = numeric_columns(df)
+    ranks = df[columns].rank(method='average').to_numpy(dtype=np.float64, copy=True)
+    ranks -= np.nanmean(ranks, axis=0)
+    np.nan_to_num(ranks, copy=False, nan=0.0)
+    norms = np.sqrt(np.einsum('ij,ij->j', ranks, ranks))
+    norms[norms == 0] = np.nan
+    ranks /= norms
+    matrix = ranks.T @ ranks
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+
+def _category_codes(df, columns):
+    # Códigos inteiros compactos por coluna (NA vira uma categoria própria)
+    codes, sizes = [], []
+    for col in columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            raw = values.cat.codes.to_numpy().astype(np.int64)
+        else:
+            raw = pd.factorize(values, use_na_sentinel=True)[0].astype(np.int64)
+        raw[raw < 0] = raw.max(initial=-1) + 1
+        # Remove categorias sem ocorrência no recorte filtrado
+        _, compact = np.unique(raw, return_inverse=True)
+        codes.append(compact.ravel())
+        sizes.append(int(compact.max(initial=-1)) + 1)
+    return codes, sizes
+
+
+def cramers_v_matrix(df):
+    """V de Cramer entre todas as categóricas e o preço dividido em quartis.
+
+    Cada tabela de contingência sai de um `np.bincount` sobre os códigos
+    combinados; o qui-quadrado usa a forma n·(Σ O²/(linha·coluna) − 1).
+    """
+    columns = [col for col in CATEGORICAL_COLUMNS if col in df.columns]
+    quartiles = pd.qcut(df[TARGET].rank(method='first'), 4, labels=False)
+    frame = df[columns].assign(**{PRICE_QUARTILE: quartiles})
+    columns = columns + [PRICE_QUARTILE]
+
+    codes, sizes = _category_codes(frame, columns)
+    n = len(frame)
+    k = len(columns)
+    matrix = np.eye(k)
+    for i in range(k):
+        for j in range(i + 1, k):
+            if sizes[i] < 2 or sizes[j] < 2:
+                value = np.nan
+            else:
+                table = np.bincount(codes[i] * sizes[j] + codes[j],
+                                    minlength=sizes[i] * sizes[j]).reshape(sizes[i], sizes[j])
+                rows = table.sum(axis=1)
+                cols = table.sum(axis=0)
+                chi2 = n * ((table ** 2 / np.outer(rows, cols)).sum() - 1.0)
+                value = np.sqrt(chi2 / (n * (min(sizes[i], sizes[j]) - 1)))
+            matrix[i, j] = matrix[j, i] = value
+    for i in range(k):
+        if sizes[i] < 2:
+            matrix[i, i] = np.nan
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+
+# Memorizado por versão do dataset e estado dos filtros: no processo (cache_data)
+# e no cache em disco compartilhado entre sessões, processos e reinícios
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_spearman(data_version, price_range, quality_range, _filtered_df):
+    key = content_key('spearman', data_version, price_range, quality_range)
+    return get_result_store().get_or_compute(key, lambda: spearman_matrix(_filtered_df))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_cramers_v(data_version, price_range, quality_range, _filtered_df):
+    key = content_key('cramers_v', data_version, price_range, quality_range)
+    return get_result_store().get_or_compute(key, lambda: cramers_v_matrix(_filtered_df))
@@ -0,0 +1,208 @@
+"""API HTTP de previsão, sem a interface do Streamlit.
+
+Uso:
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+    GET  /health          estado do serviço e chave do modelo
+    POST /predict         {"listing": {"Gr Liv Area": 1500, "Neighborhood": "NAmes", ...}}
+    POST /predict/batch   {"listings": [{...}, {...}]}
+
+Os dois endpoints codificam com o pipeline do modelo (`FeaturePipeline`), como o
+dashboard: campos ausentes ou nulos recebem a mediana do treino nas numéricas,
+'None' nas categóricas em que NA é "não possui" e a moda nas demais. Requisições
+concorrentes são agrupadas em uma única chamada `inplace_predict`; com a fila
+cheia a API responde 503 com Retry-After. As linhas previstas alimentam o
+monitor de drift (`drift.py`), registrado a cada AMES_DRIFT_FLUSH_ROWS linhas.
+"""
+import asyncio
+import contextlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from data import read_dataset
+from drift import load_monitor
+from model import load_or_train, production_params
+from valuation import ListingPredictor
+
+MAX_BATCH_ROWS = int(os.environ.get('AMES_API_MAX_BATCH_ROWS', '512'))
+MAX_WAIT_MS = float(os.environ.get('AMES_API_MAX_WAIT_MS', '2'))
+MAX_QUEUE = int(os.environ.get('AMES_API_MAX_QUEUE', '2048'))
+MAX_REQUEST_ROWS = 10_000
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class MicroBatcher:
+    """Agrupa linhas de requisições concorrentes em lotes para o booster.
+
+    Cada requisição entra numa fila limitada; o laço de despacho junta o que
+    chegar em até `max_wait_ms` (ou até `max_rows` linhas) e executa uma única
+    previsão numa thread, devolvendo a fatia de cada requisição.
+    """
+
+    def __init__(self, predict, max_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS, max_queue=MAX_QUEUE):
+        self.predict = predict
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, X):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((X, future))
+        except asyncio.QueueFull:
+            raise QueueFullError() from None
+        return await future
+
+    async def _collect(self):
+        items = [await self.queue.get()]
+        rows = len(items[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while rows < self.max_rows:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            X = items[0][0] if len(items) == 1 else np.concatenate([x for x, _ in items])
+            try:
+                predictions = await loop.run_in_executor(None, self.predict, X)
+            except Exception as error:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.batches += 1
+            self.rows += len(X)
+            start = 0
+            for x, future in items:
+                if not future.done():
+                    future.set_result(predictions[start:start + len(x)])
+                start += len(x)
+
+
+async def _read_json(request):
+    try:
+        return await request.json()
+    except json.JSONDecodeError:
+        return None
+
+
+def _error(message, status_code):
+    return JSONResponse({'error': message}, status_code=status_code)
+
+
+def _check_listings(listings, known):
+    """Resposta de erro para imóveis que não são objetos ou trazem variáveis desconhecidas."""
+    if not all(isinstance(listing, dict) for listing in listings):
+        return _error("Cada imóvel deve ser um objeto JSON", 400)
+    unknown = list(dict.fromkeys(col for listing in listings for col in listing if col not in known))
+    if unknown:
+        return _error(f"Variáveis desconhecidas: {', '.join(unknown)}", 422)
+    return None
+
+
+async def health(request):
+    state = request.app.state
+    return JSONResponse({'status': 'ok', 'model': state.model.key,
+                         'batches': state.batcher.batches, 'rows': state.batcher.rows})
+
+
+async def predict(request):
+    payload = await _read_json(request)
+    if not isinstance(payload, dict):
+        return _error("JSON inválido", 400)
+    listing = payload.get('listing', payload)
+    predictor = request.app.state.predictor
+    error = _check_listings([listing], predictor.positions)
+    if error is not None:
+        return error
+    try:
+        row = predictor.encode(listing).copy()
+    except (TypeError, ValueError) as error:
+        return _error(str(error), 422)
+    try:
+        prediction = await request.app.state.batcher.submit(row)
+    except QueueFullError:
+        return JSONResponse({'error': "Servidor ocupado"}, status_code=503, headers={'Retry-After': '1'})
+    return JSONResponse({'prediction': float(prediction[0]), 'model': request.app.state.model.key})
+
+
+async def predict_batch(request):
+    payload = await _read_json(request)
+    listings = payload.get('listings') if isinstance(payload, dict) else None
+    if not isinstance(listings, list) or not listings:
+        return _error("Envie {'listings': [...]} com ao menos um imóvel", 400)
+    if len(listings) > MAX_REQUEST_ROWS:
+        return _error(f"Máximo de {MAX_REQUEST_ROWS:,} imóveis por requisição", 413)
+    model = request.app.state.model
+    error = _check_listings(listings, request.app.state.predictor.positions)
+    if error is not None:
+        return error
+    frame = pd.DataFrame.from_records(listings).reindex(columns=model.features)
+    try:
+        X = model.encode(frame)
+    except (TypeError, ValueError) as error:
+        return _error(str(error), 422)
+    try:
+        predictions = await request.app.state.batcher.submit(X)
+    except QueueFullError:
+        return JSONResponse({'error': "Servidor ocupado"}, status_code=503, headers={'Retry-After': '1'})
+    return JSONResponse({'predictions': predictions.astype(float).tolist(), 'model': model.key})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Mesmo booster persistido e mesmo pré-processamento usados pelo app.py
+    dataset = read_dataset()
+    model = load_or_train(dataset.df, dataset.version, production_params())
+    app.state.model = model
+    app.state.predictor = ListingPredictor(model)
+    monitor = load_monitor(model, dataset.df)
+
+    def predict(X):
+        # Roda no executor: o esboço de drift é atualizado junto com a previsão do lote
+        predictions = model.booster.inplace_predict(X)
+        monitor.observe(X, predictions, 'api')
+        return predictions
+
+    app.state.batcher = MicroBatcher(predict)
+    task = asyncio.create_task(app.state.batcher.run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        monitor.flush()
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health),
+        Route('/predict', predict, methods=['POST']),
+        Route('/predict/batch', predict_batch, methods=['POST']),
+    ],
+    lifespan=lifespan,
+)
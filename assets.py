@@ -0,0 +1,153 @@
+"""Pré-conversão das figuras do estudo para WebP em várias larguras.
+
+Uso:
+    python assets.py          # gera static/ (também é feito sob demanda pelo app)
+
+As variantes vão para `static/`, servida pelo próprio Streamlit em `app/static/`
+(`server.enableStaticServing`). Os nomes levam o hash do PNG de origem, então
+um proxy na frente do app pode marcá-las como `Cache-Control: immutable`; o
+servidor do Streamlit já responde com ETag/Last-Modified para revalidação.
+
+Só entram formatos que o static serving do Streamlit envia com o Content-Type
+correto: AVIF sai como text/plain (com nosniff) e o navegador não o exibe.
+"""
+import hashlib
+import html
+import io
+import json
+import os
+from functools import lru_cache
+
+import streamlit as st
+from PIL import Image, features
+
+from data import BASE_DIR
+
+STATIC_DIR = BASE_DIR / 'static'
+STATIC_URL = 'app/static'
+MANIFEST_PATH = STATIC_DIR / 'manifest.json'
+SOURCE_IMAGES = ['correlacao_spearman.png', 'v_de_cramer.png', 'distribuicao_erros.png']
+WIDTHS = (480, 960, 1600)
+FORMATS = {'webp': {'quality': 82, 'method': 6}}
+
+
+def available_formats():
+    # Depende de como o Pillow foi compilado
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def _variant_name(stem, digest, width, fmt):
+    return f'{stem}-{digest}-{width}w.{fmt}'
+
+
+def build_asset(source, formats=None):
+    """Gera as variantes de uma imagem (as já existentes são mantidas) e retorna sua entrada no manifesto."""
+    formats = formats or available_formats()
+    data = (BASE_DIR / source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem = os.path.splitext(source)[0]
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        width, height = image.size
+        widths = sorted({w for w in WIDTHS if w < width} | {width})
+        variants = {fmt: [] for fmt in formats}
+        for w in widths:
+            resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+            for fmt in formats:
+                name = _variant_name(stem, digest, w, fmt)
+                target = STATIC_DIR / name
+                if not target.exists():
+                    tmp = target.with_name(f'{name}.{os.getpid()}.tmp')
+                    resized.save(tmp, format=fmt.upper(), **FORMATS[fmt])
+                    os.replace(tmp, target)
+                variants[fmt].append([w, name])
+    return {'source': source, 'sha256': digest, 'width': width, 'height': height, 'variants': variants}
+
+
+def build_assets(sources=SOURCE_IMAGES):
+    STATIC_DIR.mkdir(exist_ok=True)
+    manifest = {os.path.splitext(source)[0]: build_asset(source) for source in sources}
+    tmp = MANIFEST_PATH.with_name(f'manifest.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    os.replace(tmp, MANIFEST_PATH)
+    return manifest
+
+
+def _is_current(manifest, sources):
+    formats = available_formats()
+    for source in sources:
+        entry = manifest.get(os.path.splitext(source)[0])
+        if entry is None or list(entry['variants']) != formats:
+            return False
+        digest = hashlib.sha256((BASE_DIR / source).read_bytes()).hexdigest()[:12]
+        if entry['sha256'] != digest:
+            return False
+        for variants in entry['variants'].values():
+            if not all((STATIC_DIR / name).exists() for _, name in variants):
+                return False
+    return True
+
+
+def load_manifest(sources=SOURCE_IMAGES):
+    if MANIFEST_PATH.exists():
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+        if _is_current(manifest, sources):
+            return manifest
+    return build_assets(sources)
+
+
+@st.cache_resource(show_spinner=False)
+def get_manifest():
+    # Uma verificação (e, se preciso, conversão) por processo
+    return load_manifest()
+
+
+def _srcset(variants):
+    return ', '.join(f'{STATIC_URL}/{name} {w}w' for w, name in variants)
+
+
+@lru_cache(maxsize=None)
+def picture_html(name, alt, caption=None, sizes='100vw'):
+    """<picture> com variantes responsivas; o navegador baixa só a largura de que precisa."""
+    entry = get_manifest()[name]
+    formats = [fmt for fmt, variants in entry['variants'].items() if variants]
+    sources = ''.join(
+        f'<source type="image/{fmt}" srcset="{_srcset(entry["variants"][fmt])}" sizes="{sizes}">'
+        for fmt in formats
+    )
+    # <img> usa a menor variante do último formato (o de suporte mais amplo em FORMATS)
+    fallback = entry['variants'][formats[-1]][0][1]
+    caption_html = (f'<figcaption style="color: #a0a0a0; font-size: 0.85em; text-align: center;">'
+                    f'{html.escape(caption)}</figcaption>') if caption else ''
+    return (
+        f'<figure style="margin: 0;"><picture>{sources}'
+        f'<img src="{STATIC_URL}/{fallback}" alt="{html.escape(alt)}" width="{entry["width"]}" '
+        f'height="{entry["height"]}" loading="lazy" decoding="async" style="width: 100%; height: auto;">'
+        f'</picture>{caption_html}</figure>'
+    )
+
+
+@lru_cache(maxsize=32)
+def asset_bytes(name, width=960, fmt=None):
+    """Bytes já codificados de uma variante (cache do processo), para quando o static serving está desligado."""
+    entry = get_manifest()[name]
+    fmt = fmt or next(f for f, variants in entry['variants'].items() if variants)
+    variants = dict(entry['variants'][fmt])
+    chosen = min(variants, key=lambda w: (w < width, abs(w - width)))
+    return (STATIC_DIR / variants[chosen]).read_bytes()
+
+
+def show_image(name, alt, caption=None, sizes='100vw'):
+    if not any(get_manifest()[name]['variants'].values()):
+        # Pillow sem nenhum dos formatos: a figura original
+        st.image(str(BASE_DIR / get_manifest()[name]['source']), caption=caption, width='stretch')
+    elif st.get_option('server.enableStaticServing'):
+        st.markdown(picture_html(name, alt, caption, sizes), unsafe_allow_html=True)
+    else:
+        st.image(asset_bytes(name), caption=caption, width='stretch')
+
+
+if __name__ == '__main__':
+    for name, entry in build_assets().items():
+        total = sum((STATIC_DIR / n).stat().st_size for v in entry['variants'].values() for _, n in v)
+        print(f"{entry['source']}: {sum(len(v) for v in entry['variants'].values())} variantes, {total / 1024:.0f} KB")
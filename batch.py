@@ -0,0 +1,67 @@
+import io
+
+import numpy as np
+
+from comps import BLOCK_COLUMN, COMP_FEATURES, DEFAULT_K
+from model import TARGET
+from preprocessing import read_csv_chunks
+
+# Linhas por bloco: limita a memória usada por bloco independentemente do arquivo
+CHUNK_ROWS = 10_000
+ID_COLUMNS = ['Order', 'PID']
+PREDICTION_COLUMN = 'Predicted SalePrice'
+COMPS_COLUMN = 'Comps Median SalePrice'
+
+
+def score_chunks(model, source, chunk_rows=CHUNK_ROWS, monitor=None):
+    """Gera (bloco, previsões) para um CSV no esquema do AmesHousing.
+
+    Cada bloco passa pelo pré-processamento vetorizado e por uma única chamada
+    a `inplace_predict`; a matriz de features é reaproveitada entre blocos.
+    Com `monitor` (um `drift.DriftMonitor`), a matriz e as previsões de cada
+    bloco entram no esboço de drift do lote.
+    """
+    buffer = np.empty((chunk_rows, len(model.features)), dtype=np.float32)
+    for chunk in read_csv_chunks(source, chunk_rows):
+        missing = [col for col in model.features if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Colunas ausentes no arquivo: {', '.join(missing)}")
+        X = model.encode(chunk, out=buffer[:len(chunk)])
+        predictions = model.booster.inplace_predict(X)
+        if monitor is not None:
+            monitor.observe(X, predictions, 'lote')
+        yield chunk, predictions
+
+
+def write_predictions(model, source, target, chunk_rows=CHUNK_ROWS, on_chunk=None, comps=None, k=DEFAULT_K,
+                      monitor=None):
+    """Escreve um CSV com identificadores e preço previsto; retorna o nº de linhas.
+
+    Com `comps` (um `comps.CompsIndex`), cada bloco também é consultado de uma
+    vez no índice de comparáveis e ganha a mediana de preço dos K mais parecidos.
+    Se o arquivo traz SalePrice, a própria venda (já indexada) não conta como comparável.
+    """
+    total = 0
+    for i, (chunk, predictions) in enumerate(score_chunks(model, source, chunk_rows, monitor)):
+        keep = [col for col in ID_COLUMNS + [TARGET] if col in chunk.columns]
+        result = chunk[keep].copy()
+        result[PREDICTION_COLUMN] = np.round(predictions, 2)
+        if comps is not None:
+            values = chunk[COMP_FEATURES].to_numpy(dtype=np.float32, na_value=np.nan)
+            own_prices = chunk[TARGET].to_numpy(dtype=np.float64, na_value=np.nan) if TARGET in chunk.columns else None
+            _, _, prices = comps.query_batch(chunk[BLOCK_COLUMN].to_numpy(), values, k, own_prices)
+            result[COMPS_COLUMN] = np.nanmedian(prices, axis=1)
+        result.to_csv(target, header=(i == 0), index=False)
+        total += len(result)
+        if on_chunk is not None:
+            on_chunk(total)
+    if monitor is not None:
+        monitor.flush('lote')
+    return total
+
+
+def predict_csv(model, source, chunk_rows=CHUNK_ROWS, on_chunk=None, comps=None, monitor=None):
+    """Versão em memória de `write_predictions`, para download no dashboard."""
+    target = io.StringIO()
+    total = write_predictions(model, source, target, chunk_rows, on_chunk, comps, monitor=monitor)
+    return target.getvalue().encode('utf-8'), total
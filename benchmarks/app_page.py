@@ -0,0 +1,20 @@
+"""Executa o app.py com a página escolhida em BENCH_PAGE (para o AppTest).
+
+O `option_menu` é um componente customizado que o AppTest não consegue clicar;
+aqui ele é substituído por uma função que devolve a página da variável de ambiente.
+"""
+import os
+import runpy
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+menu = types.ModuleType('streamlit_option_menu')
+menu.option_menu = lambda *args, **kwargs: os.environ.get('BENCH_PAGE', kwargs['options'][0])
+sys.modules['streamlit_option_menu'] = menu
+
+os.chdir(ROOT)
+runpy.run_path(str(ROOT / 'app.py'), run_name='__main__')
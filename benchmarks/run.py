@@ -0,0 +1,274 @@
+"""Suíte de benchmarks do dashboard em datasets sintéticos de escala crescente.
+
+Uso:
+    python -m benchmarks.run --scales 1 10 100 --output bench.json
+    python -m benchmarks.run --scales 1 10 --compare bench.json --tolerance 0.2
+
+Mede, para cada escala: carga do dataset (fria e da cópia colunar), filtros
+da barra lateral, construção de cada gráfico das páginas, correlações,
+previsão unitária e em lote, e reruns completos do app.py via AppTest.
+Com --compare, compara com um JSON anterior e sai com código 1 se algum
+tempo piorar além da tolerância.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import plotly.express as px
+import plotly.io as pio
+
+from aggregates import RangeAggregates
+from analytics import cramers_v_matrix, spearman_matrix
+from benchmarks.synthetic import BENCH_DATA_DIR, dataset_name, generate
+from charts import (box_figure, box_from_stats, histogram_from_counts, scatter_3d_figure, scatter_figure,
+                    with_fences)
+from cube import MarketCube
+from data import BASE_DIR, _cache_root, read_dataset
+from export import TreeArrays
+from ingestion import summarize
+from model import load_or_train, production_params
+from range_index import PriceQualityIndex
+from valuation import ListingPredictor
+
+PAGES = ["Visão Geral", "Análise de Dados", "Modelo Preditivo", "Avaliar Imóvel", "Previsão em Lote",
+         "Monitoramento", "Conclusões"]
+APP_PAGE_SCRIPT = Path(__file__).resolve().parent / 'app_page.py'
+
+
+def measure(fn, repeat=5, warmup=1):
+    """Mediana e mínimo de `repeat` execuções (após `warmup` descartadas)."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(times), 'min_s': min(times), 'repeat': repeat}
+
+
+def measure_once(fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {'median_s': elapsed, 'min_s': elapsed, 'repeat': 1}
+
+
+def _quantile_ranges(index):
+    """Faixas de filtro típicas: tudo, metade central de preço, qualidade alta."""
+    low, high = np.percentile(index.prices, [25, 75]).astype(int)
+    full_price = (int(index.price_min), int(index.price_max))
+    full_quality = (int(index.quality_min), int(index.quality_max))
+    return {
+        'all': (full_price, full_quality),
+        'price_iqr': ((int(low), int(high)), full_quality),
+        'quality_7_plus': (full_price, (7, full_quality[1])),
+    }
+
+
+def chart_builders(df, cube, summary, price_range, quality_range):
+    """Os gráficos de dados das páginas, montados como no app.py (figura + JSON)."""
+    def neighborhood_box():
+        stats = with_fences(cube.rollup('price', ['Neighborhood']))
+        return box_from_stats(stats['Neighborhood'], stats, 'SalePrice', title="Distribuição de Preços por Bairro")
+
+    def neighborhood_trend():
+        # Como na página: os bairros com mais vendas, por ano
+        largest = cube.rollup('price', ['Neighborhood']).nlargest(5, 'count')['Neighborhood']
+        stats = cube.rollup('price', ['Neighborhood', 'Yr Sold'], neighborhoods=largest)
+        return px.line(stats, x='Yr Sold', y='median', color='Neighborhood', markers=True)
+
+    def neighborhood_heatmap():
+        stats = cube.rollup('price', ['Neighborhood', 'Yr Sold'])
+        return px.imshow(stats.pivot(index='Neighborhood', columns='Yr Sold', values='median'), aspect='auto')
+
+    def price_histogram():
+        # Como na Visão Geral: contagens agregadas na ingestão, recortadas pelos filtros
+        edges, counts = summary.histogram(price_range, quality_range, bins=50)
+        return histogram_from_counts(edges, counts, "Distribuição dos Preços de Venda")
+
+    return {
+        'price_histogram': price_histogram,
+        'area_vs_price': lambda: scatter_figure(df, x='Gr Liv Area', y='SalePrice', color='Overall Qual',
+                                                title="Área Habitável vs Preço de Venda"),
+        'quality_box': lambda: box_figure(df, x='Overall Qual', y='SalePrice', title="Preço por Nível de Qualidade"),
+        'neighborhood_box': neighborhood_box,
+        'neighborhood_trend': neighborhood_trend,
+        'neighborhood_heatmap': neighborhood_heatmap,
+        'scatter_3d': lambda: scatter_3d_figure(df, x='Gr Liv Area', y='Total Bsmt SF', z='SalePrice',
+                                                color='Overall Qual', title="Relação 3D"),
+    }
+
+
+def bench_scale(scale, path, repeat):
+    results = {}
+    rows = None
+
+    def record(name, timing):
+        results[name] = dict(timing, rows=rows)
+        print(f"  x{scale:<5} {name:<32} {timing['median_s'] * 1000:10.2f} ms", flush=True)
+
+    # Carga: CSV -> cópia colunar (fria) e leitura mapeada em memória (quente)
+    shutil.rmtree(_cache_root(path), ignore_errors=True)
+    record('load.cold_csv', measure_once(lambda: read_dataset(path)))
+    record('load.columnar', measure(lambda: read_dataset(path), repeat))
+    df, version = read_dataset(path)
+    rows = len(df)
+
+    # Filtros da barra lateral
+    record('filter.build_index', measure(lambda: PriceQualityIndex.from_frame(df), repeat))
+    index = PriceQualityIndex.from_frame(df)
+    ranges = _quantile_ranges(index)
+    for name, (price_range, quality_range) in ranges.items():
+        record(f'filter.select.{name}', measure(lambda: index.select(df, price_range, quality_range), repeat))
+    aggregates = RangeAggregates(index, df)
+    record('overview.aggregates', measure(lambda: aggregates.query(*ranges['price_iqr']), repeat))
+
+    # Cubo de mercado (bairro × ano × mês × qualidade) e um recorte pelos filtros
+    record('cube.build', measure(lambda: MarketCube.build(df), repeat))
+    cube = MarketCube.build(df)
+    record('cube.rollup', measure(lambda: cube.rollup('price', ['Neighborhood'], ranges['price_iqr'][1],
+                                                      ranges['price_iqr'][0]), repeat))
+
+    # Agregados da Visão Geral (grade qualidade × faixa de preço), acumulados em blocos
+    record('summary.build', measure(lambda: summarize(df), repeat))
+    summary = summarize(df)
+
+    # Gráficos: construção da figura e serialização enviada ao navegador
+    for name, build in chart_builders(df, cube, summary, *ranges['all']).items():
+        record(f'chart.{name}', measure(lambda: pio.to_json(build(), validate=False), repeat))
+
+    # Correlações sobre o dataset inteiro
+    record('correlation.spearman', measure(lambda: spearman_matrix(df), repeat))
+    record('correlation.cramers_v', measure(lambda: cramers_v_matrix(df), repeat))
+
+    # Previsão (o treino usa só as linhas de treino, então não é medido aqui)
+    model = load_or_train(df, version, production_params())
+    predictor = ListingPredictor(model)
+    listing = {'Gr Liv Area': 1800, 'Overall Qual': 7, 'Neighborhood': 'NAmes'}
+    record('predict.single', measure(lambda: predictor.predict(listing), repeat * 20))
+    record('predict.batch', measure(lambda: model.predict(df), repeat))
+    X = model.encode(df)
+    trees = TreeArrays.from_booster(model.booster)
+    record('predict.batch_tree_arrays', measure(lambda: trees.predict(X), repeat))
+    return results
+
+
+def bench_app(scale, repeat, timeout):
+    """Reruns completos do app.py por página, com a cidade sintética selecionada."""
+    from streamlit.testing.v1 import AppTest
+
+    city = dataset_name(scale)
+    results = {}
+    for page in PAGES:
+        os.environ['BENCH_PAGE'] = page
+        at = AppTest.from_file(str(APP_PAGE_SCRIPT), default_timeout=timeout)
+        at.run()
+        next(s for s in at.sidebar.selectbox if s.label == "Cidade").set_value(city)
+        # Primeira execução na cidade: inclui os caches de recursos ainda frios
+        cold = measure_once(at.run)
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].message}")
+        warm = measure(at.run, repeat, warmup=0)
+        name = f"app.{page}"
+        results[f'{name}.first_run'] = dict(cold, rows=None)
+        results[f'{name}.rerun'] = dict(warm, rows=None)
+        print(f"  x{scale:<5} {name:<32} {cold['median_s'] * 1000:10.2f} ms (1ª) "
+              f"{warm['median_s'] * 1000:10.2f} ms (rerun)", flush=True)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(current, baseline, tolerance, min_ms=1.0):
+    """Razão atual/base por medida; retorna as que pioraram além da tolerância.
+
+    Medidas abaixo de `min_ms` nos dois lados são listadas mas não contam como
+    regressão (ruído de relógio domina nessa faixa).
+    """
+    regressions = []
+    print(f"\n{'medida':<48} {'base (ms)':>12} {'atual (ms)':>12} {'razão':>8}")
+    for scale, results in current['results'].items():
+        previous = baseline['results'].get(scale, {})
+        for name, timing in results.items():
+            if name not in previous:
+                continue
+            before, after = previous[name]['median_s'], timing['median_s']
+            ratio = after / before if before > 0 else float('inf')
+            slow = ratio > 1 + tolerance and max(before, after) * 1000 >= min_ms
+            flag = ' <-- regressão' if slow else ''
+            print(f"x{scale} {name:<44} {before * 1000:12.2f} {after * 1000:12.2f} {ratio:8.2f}{flag}")
+            if flag:
+                regressions.append((scale, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="multiplicadores do AmesHousing.csv (1000 gera ~2,9 milhões de linhas)")
+    parser.add_argument('--app-scales', type=int, nargs='*', default=[1],
+                        help="escalas em que o app.py inteiro é executado via AppTest")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--app-timeout', type=float, default=600)
+    parser.add_argument('--regenerate', action='store_true', help="recria os CSVs sintéticos")
+    parser.add_argument('--output', type=Path, default=None, help="grava os resultados em JSON")
+    parser.add_argument('--compare', type=Path, default=None, help="JSON de referência")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="piora relativa aceita no modo de comparação (0.2 = 20%%)")
+    parser.add_argument('--min-ms', type=float, default=1.0,
+                        help="medidas mais rápidas que isso não contam como regressão")
+    args = parser.parse_args()
+
+    # O app.py lista as cidades desta pasta (os CSVs sintéticos) além de Ames
+    os.environ['AMES_CITIES_DIR'] = str(BENCH_DATA_DIR)
+
+    report = {'environment': environment(), 'results': {}}
+    for scale in sorted(set(args.scales) | set(args.app_scales)):
+        path = BENCH_DATA_DIR / f'{dataset_name(scale)}.csv'
+        if args.regenerate or not path.exists():
+            print(f"Gerando {path.name}...", flush=True)
+            generate(scale, path)
+        results = {}
+        if scale in args.scales:
+            results.update(bench_scale(scale, path, args.repeat))
+        if scale in args.app_scales:
+            results.update(bench_app(scale, args.repeat, args.app_timeout))
+        report['results'][str(scale)] = results
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"Resultados gravados em {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.tolerance, args.min_ms)
+        if regressions:
+            print(f"\n{len(regressions)} medida(s) pioraram mais de {args.tolerance:.0%}.")
+            sys.exit(1)
+        print("\nSem regressões.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Datasets sintéticos no esquema do AmesHousing.csv em escalas 1x, 10x, 100x, 1000x.
+
+As linhas são reamostradas (bootstrap) do dataset original; áreas, valores e
+preço recebem um ruído multiplicativo pequeno para não repetir linhas idênticas.
+
+Uso:
+    python -m benchmarks.synthetic --scales 1 10 100
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data import CACHE_DIR, CSV_PATH
+
+BENCH_DATA_DIR = CACHE_DIR / 'benchmarks' / 'datasets'
+CHUNK_ROWS = 100_000
+# Colunas contínuas que recebem ruído (as demais são copiadas como no original)
+JITTER_COLUMNS = [
+    'Lot Frontage', 'Lot Area', 'Mas Vnr Area', 'BsmtFin SF 1', 'BsmtFin SF 2',
+    'Bsmt Unf SF', 'Total Bsmt SF', '1st Flr SF', '2nd Flr SF', 'Gr Liv Area',
+    'Garage Area', 'Wood Deck SF', 'Open Porch SF', 'SalePrice'
+]
+JITTER_SIGMA = 0.05
+
+
+def dataset_name(scale):
+    return f'ames_x{scale}'
+
+
+def generate(scale, target=None, seed=0, source=CSV_PATH):
+    """Grava o CSV sintético em blocos (memória limitada) e retorna o caminho."""
+    base = pd.read_csv(source)
+    target = target or BENCH_DATA_DIR / f'{dataset_name(scale)}.csv'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    total = len(base) * scale
+
+    with open(target, 'w', newline='', encoding='utf-8') as f:
+        for start in range(0, total, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, total - start)
+            chunk = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+            if scale > 1:
+                for col in JITTER_COLUMNS:
+                    noise = rng.lognormal(0.0, JITTER_SIGMA, n)
+                    chunk[col] = (chunk[col] * noise).round()
+            chunk['Order'] = np.arange(start + 1, start + n + 1)
+            chunk['PID'] = 900_000_000 + chunk['Order']
+            chunk.to_csv(f, header=(start == 0), index=False)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for scale in args.scales:
+        print(generate(scale, seed=args.seed))
+
+
+if __name__ == '__main__':
+    main()
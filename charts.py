@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Faixas de renderização: o volume enviado ao navegador fica limitado
+RAW_POINT_LIMIT = 5_000       # até aqui: SVG com todos os pontos
+WEBGL_POINT_LIMIT = 50_000    # até aqui: WebGL (scattergl) com todos os pontos
+SAMPLE_POINTS = 20_000        # acima: amostra estratificada por Overall Qual em WebGL
+SCATTER_3D_LIMIT = 10_000     # scatter 3D já usa WebGL; acima disso, amostra
+BOX_RAW_LIMIT = 5_000         # acima: box plot a partir de quartis pré-calculados
+STRATUM_COLUMN = 'Overall Qual'
+
+
+def stratified_sample(df, n, by=STRATUM_COLUMN, seed=0):
+    """Amostra de até `n` linhas mantendo a proporção de cada estrato de `by`."""
+    if len(df) <= n:
+        return df
+    strata = pd.factorize(df[by])[0]
+    rng = np.random.default_rng(seed)
+    # Ordena por estrato com desempate aleatório e pega o início de cada bloco
+    order = np.lexsort((rng.random(len(df)), strata))
+    counts = np.bincount(strata)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    quotas = np.maximum(1, np.round(counts * n / len(df)).astype(int))
+    picks = np.concatenate([order[s:s + q] for s, q in zip(starts, quotas)])
+    return df.take(picks)
+
+
+def _sample_title(title, shown, total):
+    if shown == total:
+        return title
+    return f"{title} (amostra de {shown:,} de {total:,} imóveis)"
+
+
+def scatter_figure(df, x, y, title, **kwargs):
+    """px.scatter com a faixa adequada ao número de pontos."""
+    total = len(df)
+    if total <= RAW_POINT_LIMIT:
+        return px.scatter(df, x=x, y=y, title=title, render_mode='svg', **kwargs)
+    if total > WEBGL_POINT_LIMIT:
+        df = stratified_sample(df, SAMPLE_POINTS)
+    return px.scatter(df, x=x, y=y, title=_sample_title(title, len(df), total),
+                      render_mode='webgl', **kwargs)
+
+
+def scatter_3d_figure(df, x, y, z, title, **kwargs):
+    total = len(df)
+    columns = [c for c in dict.fromkeys([x, y, z, kwargs.get('color'), STRATUM_COLUMN]) if c]
+    df = stratified_sample(df[columns], SCATTER_3D_LIMIT)
+    return px.scatter_3d(df, x=x, y=y, z=z, title=_sample_title(title, len(df), total), **kwargs)
+
+
+def box_stats(df, x, y):
+    """Quartis e limites dos bigodes (1,5 IQR) de `y` por grupo de `x`."""
+    grouped = df.groupby(x, observed=True)[y]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['min'] = grouped.min()
+    stats['max'] = grouped.max()
+    return with_fences(stats)
+
+
+def with_fences(stats):
+    """Acrescenta os limites dos bigodes (1,5 IQR, sem passar de min/max) a quartis já calculados."""
+    iqr = stats['q3'] - stats['q1']
+    stats['lowerfence'] = np.maximum(stats['min'], stats['q1'] - 1.5 * iqr)
+    stats['upperfence'] = np.minimum(stats['max'], stats['q3'] + 1.5 * iqr)
+    return stats
+
+
+def box_from_stats(x, stats, name, title, color=None):
+    """Box plot desenhado só com quartis e bigodes já calculados (sem os pontos)."""
+    fig = go.Figure(go.Box(
+        x=x, q1=stats['q1'], median=stats['median'], q3=stats['q3'],
+        lowerfence=stats['lowerfence'], upperfence=stats['upperfence'],
+        marker_color=color, name=name
+    ))
+    fig.update_layout(title=title)
+    return fig
+
+
+def histogram_from_counts(edges, counts, title, color=None):
+    """Histograma desenhado com contagens já agregadas: uma barra por faixa, sem os valores brutos."""
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, title=title,
+                 color_discrete_sequence=[color] if color else None)
+    fig.update_traces(width=np.diff(edges), hovertemplate="$%{x:,.0f}: %{y} imóveis<extra></extra>")
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def box_figure(df, x, y, title, color_discrete_sequence=None):
+    """px.box com os pontos brutos ou, acima do limite, só com as estatísticas por grupo."""
+    if len(df) <= BOX_RAW_LIMIT:
+        return px.box(df, x=x, y=y, title=title, color_discrete_sequence=color_discrete_sequence)
+    stats = box_stats(df, x, y)
+    groups = stats.index.astype(str) if isinstance(df[x].dtype, pd.CategoricalDtype) else stats.index
+    return box_from_stats(groups, stats, y, title, (color_discrete_sequence or [None])[0])
@@ -0,0 +1,262 @@
+"""Imóveis comparáveis ("comps"): as K vendas mais parecidas com um imóvel.
+
+Uso:
+    python comps.py                     # constrói (ou atualiza) o índice do AmesHousing.csv
+    python comps.py --k 10 --queries 2000
+
+O índice padroniza Gr Liv Area, Overall Qual, Total Bsmt SF e Year Built e
+separa os pontos por Neighborhood; cada consulta é uma busca exaustiva no
+bloco do bairro, feita como produto de matrizes (||q||² + ||p||² − 2·q·pᵀ).
+Fica salvo em `.cache/comps/<versão>.npz`. Quando um dataset novo começa com
+as mesmas linhas de um índice salvo (vendas acrescentadas ao fim do CSV), só
+as linhas novas são padronizadas e anexadas aos blocos.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data import CACHE_DIR, read_dataset
+
+COMPS_DIR = CACHE_DIR / 'comps'
+COMP_FEATURES = ['Gr Liv Area', 'Overall Qual', 'Total Bsmt SF', 'Year Built']
+BLOCK_COLUMN = 'Neighborhood'
+PRICE_COLUMN = 'SalePrice'
+DEFAULT_K = 5
+# Teto de elementos da matriz de distâncias por passo (consultas × pontos do bloco)
+MAX_DISTANCE_CELLS = 4_000_000
+# Distância padronizada abaixo da qual um resultado com o mesmo preço é a própria venda consultada
+# (perto de zero, a distância pelo produto de matrizes em float32 carrega erro de arredondamento)
+SELF_MATCH_DISTANCE = 1e-2
+
+
+def row_hashes(df):
+    """Hash por linha das colunas indexadas; o prefixo identifica as linhas já no índice."""
+    return pd.util.hash_pandas_object(df[COMP_FEATURES + [BLOCK_COLUMN, PRICE_COLUMN]], index=False).to_numpy()
+
+
+def prefix_fingerprint(hashes, rows):
+    return hashlib.sha256(hashes[:rows].tobytes()).hexdigest()[:16]
+
+
+class CompsIndex:
+    """Pontos padronizados por bairro, com posição (linha do dataset) e preço de venda.
+
+    A padronização (média e desvio) é fixada na construção: anexar vendas não
+    altera os pontos já indexados. Bairros com menos de K vendas — ou ausentes
+    do índice — são respondidos com a busca sobre todos os bairros.
+    """
+
+    def __init__(self, mean, scale, blocks=None, rows=0, fingerprint=None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        # bairro → (pontos float32 C-contíguos, normas², linhas, preços)
+        self.blocks = blocks or {}
+        self.rows = rows
+        self.fingerprint = fingerprint
+        self._all = None
+
+    @classmethod
+    def build(cls, df, hashes=None):
+        values = df[COMP_FEATURES].to_numpy(dtype=np.float64, na_value=np.nan)
+        scale = np.nanstd(values, axis=0)
+        index = cls(np.nanmean(values, axis=0), np.where(scale > 0, scale, 1.0))
+        index.append(df, hashes=hashes)
+        return index
+
+    def standardize(self, values):
+        points = (np.asarray(values, dtype=np.float32) - self.mean) / self.scale
+        # Campo ausente fica na média: não aproxima nem afasta
+        return np.nan_to_num(points, nan=0.0)
+
+    def append(self, df, hashes=None):
+        """Anexa as linhas de `df` a partir de `self.rows` (as anteriores já estão no índice)."""
+        new = df.iloc[self.rows:]
+        if len(new):
+            points = self.standardize(new[COMP_FEATURES].to_numpy(dtype=np.float32, na_value=np.nan))
+            row_ids = np.arange(self.rows, len(df), dtype=np.int64)
+            prices = new[PRICE_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+            blocks = pd.Categorical(new[BLOCK_COLUMN])
+            order = np.argsort(blocks.codes, kind='stable')
+            bounds = np.searchsorted(blocks.codes[order], np.arange(len(blocks.categories) + 1))
+            for code, name in enumerate(blocks.categories):
+                selected = order[bounds[code]:bounds[code + 1]]
+                if len(selected):
+                    self._extend(str(name), points[selected], row_ids[selected], prices[selected])
+            self._all = None
+        self.rows = len(df)
+        hashes = row_hashes(df) if hashes is None else hashes
+        self.fingerprint = prefix_fingerprint(hashes, self.rows)
+        return self
+
+    def _extend(self, name, points, row_ids, prices):
+        old = self.blocks.get(name)
+        if old is not None:
+            points = np.concatenate([old[0], points])
+            row_ids = np.concatenate([old[2], row_ids])
+            prices = np.concatenate([old[3], prices])
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        self.blocks[name] = (points, np.einsum('ij,ij->i', points, points), row_ids, prices)
+
+    def _everything(self):
+        if self._all is None:
+            parts = list(self.blocks.values())
+            self._all = tuple(np.concatenate([part[i] for part in parts]) for i in range(4))
+        return self._all
+
+    def _search(self, block, queries, k):
+        points, norms, row_ids, prices = block
+        k = min(k, len(points))
+        ids = np.empty((len(queries), k), dtype=np.int64)
+        distances = np.empty((len(queries), k), dtype=np.float32)
+        step = max(1, MAX_DISTANCE_CELLS // max(len(points), 1))
+        for start in range(0, len(queries), step):
+            q = queries[start:start + step]
+            d = np.einsum('ij,ij->i', q, q)[:, None] + norms[None, :] - 2 * (q @ points.T)
+            if k < len(points):
+                nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+            else:
+                nearest = np.broadcast_to(np.arange(k), (len(q), k))
+            d = np.take_along_axis(d, nearest, axis=1)
+            ranked = np.argsort(d, axis=1)
+            ids[start:start + len(q)] = np.take_along_axis(nearest, ranked, axis=1)
+            distances[start:start + len(q)] = np.sqrt(np.maximum(np.take_along_axis(d, ranked, axis=1), 0))
+        return row_ids[ids], distances, prices[ids]
+
+    def query_batch(self, neighborhoods, values, k=DEFAULT_K, own_prices=None):
+        """Top-K de cada consulta: (linhas do dataset, distâncias padronizadas, preços), cada um (n × K).
+
+        As consultas são agrupadas por bairro e cada grupo vira uma multiplicação
+        de matrizes contra o bloco correspondente. Com `own_prices` (o preço de
+        venda de cada consulta, NaN se desconhecido), vendas já indexadas não
+        entram nos próprios comparáveis.
+        """
+        if own_prices is not None:
+            return self._without_self(neighborhoods, values, k, np.asarray(own_prices, dtype=np.float64))
+        queries = self.standardize(values)
+        k = min(k, self.rows)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        prices = np.full((len(queries), k), np.nan)
+        groups = pd.Categorical(neighborhoods)
+        for code in np.unique(groups.codes):
+            selected = np.flatnonzero(groups.codes == code)
+            block = self.blocks.get(str(groups.categories[code])) if code >= 0 else None
+            if block is None or len(block[0]) < k:
+                block = self._everything()
+            found = self._search(block, queries[selected], k)
+            ids[selected], distances[selected], prices[selected] = found
+        return ids, distances, prices
+
+    def _without_self(self, neighborhoods, values, k, own_prices):
+        # Busca K+1 e descarta a própria venda: distância ~0 e mesmo preço
+        ids, distances, prices = self.query_batch(neighborhoods, values, k + 1)
+        own = (distances <= SELF_MATCH_DISTANCE) & (prices == own_prices[:, None])
+        ids, distances, prices = np.where(own, -1, ids), np.where(own, np.inf, distances), np.where(own, np.nan, prices)
+        order = np.argsort(own, axis=1, kind='stable')[:, :min(k, ids.shape[1])]
+        return tuple(np.take_along_axis(a, order, axis=1) for a in (ids, distances, prices))
+
+    def query(self, listing, k=DEFAULT_K):
+        """Comps de um único imóvel (dicionário com as colunas do formulário)."""
+        values = np.array([[listing.get(col, np.nan) for col in COMP_FEATURES]], dtype=np.float32)
+        k = min(k, self.rows)
+        block = self.blocks.get(str(listing.get(BLOCK_COLUMN)))
+        if block is None or len(block[0]) < k:
+            block = self._everything()
+        ids, distances, prices = self._search(block, self.standardize(values), k)
+        return ids[0], distances[0], prices[0]
+
+    def save(self, path):
+        names = sorted(self.blocks)
+        arrays = {}
+        for i, name in enumerate(names):
+            points, _, row_ids, prices = self.blocks[name]
+            arrays.update({f'points_{i}': points, f'rows_{i}': row_ids, f'prices_{i}': prices})
+        meta = {'rows': self.rows, 'fingerprint': self.fingerprint, 'blocks': names}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+        np.savez(tmp, meta=np.array(json.dumps(meta)), mean=self.mean, scale=self.scale, **arrays)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def read_meta(path):
+        with np.load(path) as arrays:
+            return json.loads(str(arrays['meta']))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            meta = json.loads(str(arrays['meta']))
+            index = cls(arrays['mean'], arrays['scale'], rows=meta['rows'], fingerprint=meta['fingerprint'])
+            for i, name in enumerate(meta['blocks']):
+                index._extend(name, arrays[f'points_{i}'], arrays[f'rows_{i}'], arrays[f'prices_{i}'])
+        return index
+
+
+def _find_prefix(hashes):
+    """Maior índice salvo cujas linhas são o começo do dataset atual."""
+    best = None
+    for path in COMPS_DIR.glob('*.npz'):
+        try:
+            meta = CompsIndex.read_meta(path)
+        except (OSError, ValueError, KeyError):
+            continue
+        if meta['rows'] <= len(hashes) and (best is None or meta['rows'] > best[1]['rows']) \
+                and meta['fingerprint'] == prefix_fingerprint(hashes, meta['rows']):
+            best = (path, meta)
+    return best
+
+
+def load_or_build(data_version, df):
+    """Índice de `data_version`: salvo, estendido a partir de um prefixo salvo ou construído."""
+    path = COMPS_DIR / f'{data_version}.npz'
+    if path.exists():
+        return CompsIndex.load(path)
+    hashes = row_hashes(df)
+    prefix = _find_prefix(hashes) if COMPS_DIR.exists() else None
+    if prefix is not None:
+        index = CompsIndex.load(prefix[0]).append(df, hashes=hashes)
+    else:
+        index = CompsIndex.build(df, hashes=hashes)
+    index.save(path)
+    return index
+
+
+@st.cache_resource(show_spinner="Indexando imóveis comparáveis...")
+def get_comps_index(data_version, _df):
+    return load_or_build(data_version, _df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--k', type=int, default=DEFAULT_K)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    dataset = read_dataset()
+    start = time.perf_counter()
+    index = load_or_build(dataset.version, dataset.df)
+    print(f"Índice com {index.rows:,} vendas em {len(index.blocks)} bairros "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    sample = dataset.df.sample(min(args.queries, len(dataset.df)), random_state=0)
+    values = sample[COMP_FEATURES].to_numpy(dtype=np.float32, na_value=np.nan)
+    start = time.perf_counter()
+    index.query_batch(sample[BLOCK_COLUMN].to_numpy(), values, args.k)
+    elapsed = time.perf_counter() - start
+    print(f"{len(sample):,} consultas top-{args.k} em {elapsed * 1000:.1f} ms "
+          f"({elapsed / len(sample) * 1e6:.0f} µs por consulta)")
+
+    listing = sample.iloc[0][COMP_FEATURES + [BLOCK_COLUMN]].to_dict()
+    start = time.perf_counter()
+    index.query(listing, args.k)
+    print(f"Consulta individual: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""Cubo de mercado Neighborhood × Yr Sold × Mo Sold × Overall Qual, pré-calculado na carga.
+
+Uso:
+    python cube.py datasets/Cidade.csv
+
+Cada célula não vazia guarda contagem, soma e soma dos quadrados de SalePrice
+e do preço por sqft, e um esboço de quantis de cada um (contagens em faixas
+logarítmicas: qualquer quantil sai com erro relativo de até RELATIVE_ACCURACY).
+Agregações por qualquer subconjunto das dimensões somam células; o filtro de
+qualidade é uma dimensão e o de preço recorta as faixas do esboço de preço,
+então os gráficos de bairro e de tempo não voltam às linhas.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data import CACHE_DIR, CSV_CHUNK_ROWS, read_dataset
+
+CUBE_DIR = CACHE_DIR / 'cube'
+DIMENSIONS = ['Neighborhood', 'Yr Sold', 'Mo Sold', 'Overall Qual']
+MONTHS = np.arange(1, 13)
+QUALITIES = np.arange(1, 11)
+RELATIVE_ACCURACY = 0.02
+# Medida → (limites do esboço); valores fora dos limites caem nas faixas das pontas
+MEASURES = {
+    'price': (10_000, 1_000_000),
+    'price_per_sqft': (10, 1_000),
+}
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class LogBins:
+    """Faixas geométricas de razão γ = (1 + α)/(1 − α); o valor representativo de
+    cada faixa está a no máximo α (relativo) de qualquer valor dentro dela."""
+
+    def __init__(self, low, high, accuracy=RELATIVE_ACCURACY):
+        gamma = (1 + accuracy) / (1 - accuracy)
+        n = int(np.ceil(np.log(high / low) / np.log(gamma)))
+        self.edges = low * gamma ** np.arange(n + 1)
+        # Faixa 0: abaixo de `low`; faixa n + 1: acima da última borda
+        self.values = np.concatenate(([low], 2 * self.edges[:-1] * gamma / (gamma + 1), [self.edges[-1]]))
+        self.size = n + 2
+
+    def index(self, values):
+        return np.searchsorted(self.edges, values, side='right')
+
+
+def measure_values(chunk):
+    prices = chunk['SalePrice'].to_numpy(dtype=np.float64, na_value=np.nan)
+    area = chunk['Gr Liv Area'].to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_sqft = np.where(area > 0, prices / area, np.nan)
+    return {'price': prices, 'price_per_sqft': per_sqft}
+
+
+class MarketCube:
+    """Células não vazias do cubo, em ordem de índice (bairro, ano, mês, qualidade)."""
+
+    def __init__(self, neighborhoods, years, cells, counts, sums, sumsqs, sketches, price_bounds):
+        self.neighborhoods = list(neighborhoods)
+        self.years = np.asarray(years)
+        self.shape = (len(self.neighborhoods), len(self.years), len(MONTHS), len(QUALITIES))
+        self.cells = cells
+        self.counts = counts
+        self.sums = sums
+        self.sumsqs = sumsqs
+        self.sketches = sketches
+        self.price_min, self.price_max = price_bounds
+        self.bins = {measure: LogBins(*limits) for measure, limits in MEASURES.items()}
+        # Coordenadas (códigos) de cada célula em cada dimensão
+        self.coords = dict(zip(DIMENSIONS, np.unravel_index(cells, self.shape)))
+
+    @classmethod
+    def build(cls, df, chunk_rows=CSV_CHUNK_ROWS):
+        neighborhoods = pd.Categorical(df['Neighborhood']).categories.astype(str)
+        years = df['Yr Sold'].to_numpy(dtype=np.float64, na_value=np.nan)
+        years = np.arange(int(np.nanmin(years)), int(np.nanmax(years)) + 1)
+        shape = (len(neighborhoods), len(years), len(MONTHS), len(QUALITIES))
+        size = int(np.prod(shape))
+        bins = {measure: LogBins(*limits) for measure, limits in MEASURES.items()}
+        counts = np.zeros(size, dtype=np.int64)
+        sums = {m: np.zeros(size) for m in MEASURES}
+        sumsqs = {m: np.zeros(size) for m in MEASURES}
+        sketches = {m: np.zeros(size * bins[m].size, dtype=np.int64) for m in MEASURES}
+        price_bounds = [np.inf, -np.inf]
+
+        # Percorre a cópia colunar em blocos: só um bloco de temporários por vez
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            codes = [
+                pd.Categorical(chunk['Neighborhood'].astype(str), categories=neighborhoods).codes.astype(np.int64),
+                chunk['Yr Sold'].to_numpy(dtype=np.float64, na_value=np.nan) - years[0],
+                chunk['Mo Sold'].to_numpy(dtype=np.float64, na_value=np.nan) - 1,
+                chunk['Overall Qual'].to_numpy(dtype=np.float64, na_value=np.nan) - 1,
+            ]
+            valid = np.ones(len(chunk), dtype=bool)
+            for code, n in zip(codes, shape):
+                valid &= (code >= 0) & (code < n)
+            cell = np.ravel_multi_index([np.where(valid, c, 0).astype(np.int64) for c in codes], shape)
+            counts += np.bincount(cell[valid], minlength=size)
+            for measure, values in measure_values(chunk).items():
+                ok = valid & ~np.isnan(values)
+                sums[measure] += np.bincount(cell[ok], weights=values[ok], minlength=size)
+                sumsqs[measure] += np.bincount(cell[ok], weights=values[ok] ** 2, minlength=size)
+                slots = cell[ok] * bins[measure].size + bins[measure].index(values[ok])
+                sketches[measure] += np.bincount(slots, minlength=size * bins[measure].size)
+                if measure == 'price' and ok.any():
+                    price_bounds = [min(price_bounds[0], values[ok].min()), max(price_bounds[1], values[ok].max())]
+
+        cells = np.flatnonzero(counts)
+        return cls(neighborhoods, years, cells, counts[cells],
+                   {m: s[cells] for m, s in sums.items()},
+                   {m: s[cells] for m, s in sumsqs.items()},
+                   {m: s.reshape(size, -1)[cells].astype(np.uint32) for m, s in sketches.items()},
+                   price_bounds)
+
+    def _mask(self, quality_range=None, neighborhoods=None, years=None):
+        mask = np.ones(len(self.cells), dtype=bool)
+        if quality_range is not None:
+            quality = self.coords['Overall Qual'] + 1
+            mask &= (quality >= quality_range[0]) & (quality <= quality_range[1])
+        if neighborhoods is not None:
+            codes = [self.neighborhoods.index(n) for n in neighborhoods if n in self.neighborhoods]
+            mask &= np.isin(self.coords['Neighborhood'], codes)
+        if years is not None:
+            mask &= np.isin(self.years[self.coords['Yr Sold']], list(years))
+        return mask
+
+    def _labels(self, dim, codes):
+        if dim == 'Neighborhood':
+            return np.asarray(self.neighborhoods, dtype=object)[codes]
+        if dim == 'Yr Sold':
+            return self.years[codes]
+        return codes + 1
+
+    def rollup(self, measure, by, quality_range=None, price_range=None, neighborhoods=None, years=None):
+        """Estatísticas de `measure` agrupadas por `by` (lista de dimensões).
+
+        Colunas: count, mean, std, min, q1, median, q3, max. O filtro de preço
+        só se aplica à medida 'price', pelas faixas do esboço; nesse caso média
+        e desvio também saem do esboço (erro relativo de até RELATIVE_ACCURACY).
+        """
+        mask = self._mask(quality_range, neighborhoods, years)
+        sketch = self.sketches[measure][mask].astype(np.int64)
+        bins = self.bins[measure]
+        price_filtered = (measure == 'price' and price_range is not None
+                          and (price_range[0] > self.price_min or price_range[1] < self.price_max))
+        if price_filtered:
+            # Faixas cujo valor representativo cai dentro do filtro
+            inside = (bins.values >= price_range[0]) & (bins.values <= price_range[1])
+            sketch[:, ~inside] = 0
+
+        keys = [self.coords[dim][mask] for dim in by]
+        group_shape = tuple(self.shape[DIMENSIONS.index(dim)] for dim in by)
+        flat = np.ravel_multi_index(keys, group_shape) if by else np.zeros(int(mask.sum()), dtype=np.int64)
+        groups, inverse = np.unique(flat, return_inverse=True)
+        totals = np.zeros((len(groups), bins.size), dtype=np.int64)
+        np.add.at(totals, inverse, sketch)
+        count = totals.sum(axis=1)
+        keep = count > 0
+        groups, totals, count = groups[keep], totals[keep], count[keep]
+
+        if price_filtered:
+            mean = totals @ bins.values / count
+            meansq = totals @ bins.values ** 2 / count
+        else:
+            n = np.bincount(inverse, weights=self.sketches[measure][mask].sum(axis=1), minlength=len(keep))[keep]
+            mean = np.bincount(inverse, weights=self.sums[measure][mask], minlength=len(keep))[keep] / n
+            meansq = np.bincount(inverse, weights=self.sumsqs[measure][mask], minlength=len(keep))[keep] / n
+
+        cumulative = np.cumsum(totals, axis=1)
+        result = {}
+        for dim, codes in zip(by, np.unravel_index(groups, group_shape) if by else []):
+            result[dim] = self._labels(dim, codes)
+        result['count'] = count
+        result['mean'] = mean
+        result['std'] = np.sqrt(np.maximum(meansq - mean ** 2, 0))
+        result['min'] = bins.values[np.argmax(totals > 0, axis=1)]
+        for name, q in zip(('q1', 'median', 'q3'), QUANTILES):
+            # Interpolação linear entre as posições vizinhas, como em Series.quantile
+            position = q * (count - 1)
+            lower = bins.values[np.argmax(cumulative > np.floor(position)[:, None], axis=1)]
+            upper = bins.values[np.argmax(cumulative > np.ceil(position)[:, None], axis=1)]
+            result[name] = lower + (position - np.floor(position)) * (upper - lower)
+        result['max'] = bins.values[bins.size - 1 - np.argmax(totals[:, ::-1] > 0, axis=1)]
+        return pd.DataFrame(result)
+
+    def to_arrays(self):
+        arrays = {'neighborhoods': np.asarray(self.neighborhoods, dtype=str), 'years': self.years,
+                  'cells': self.cells, 'counts': self.counts,
+                  'price_bounds': np.array([self.price_min, self.price_max])}
+        for m in MEASURES:
+            arrays.update({f'sum_{m}': self.sums[m], f'sumsq_{m}': self.sumsqs[m], f'sketch_{m}': self.sketches[m]})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['neighborhoods'].tolist(), arrays['years'], arrays['cells'], arrays['counts'],
+                   {m: arrays[f'sum_{m}'] for m in MEASURES}, {m: arrays[f'sumsq_{m}'] for m in MEASURES},
+                   {m: arrays[f'sketch_{m}'] for m in MEASURES}, tuple(arrays['price_bounds']))
+
+
+def load_or_build(data_version, df):
+    path = CUBE_DIR / f'{data_version}.npz'
+    if path.exists():
+        with np.load(path) as arrays:
+            return MarketCube.from_arrays(dict(arrays))
+    cube = MarketCube.build(df)
+    CUBE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{data_version}.{os.getpid()}.tmp.npz')
+    np.savez(tmp, **cube.to_arrays())
+    os.replace(tmp, path)
+    return cube
+
+
+@st.cache_resource(show_spinner="Montando o cubo de mercado...")
+def get_cube(data_version, _df):
+    return load_or_build(data_version, _df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('csv', type=Path, nargs='?')
+    args = parser.parse_args()
+
+    df, version = read_dataset(args.csv) if args.csv else read_dataset()
+    start = time.perf_counter()
+    cube = MarketCube.build(df)
+    print(f"{len(df):,} imóveis → {len(cube.cells):,} células não vazias de {int(np.prod(cube.shape)):,} "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    start = time.perf_counter()
+    by_neighborhood = cube.rollup('price', ['Neighborhood'], quality_range=(5, 8))
+    print(f"Mediana por bairro (qualidade 5–8): {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(by_neighborhood.nlargest(5, 'median')[['Neighborhood', 'count', 'median', 'mean']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
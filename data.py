@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+BASE_DIR = Path(__file__).resolve().parent
+CSV_PATH = BASE_DIR / 'AmesHousing.csv'
+CACHE_DIR = BASE_DIR / '.cache'
+# Linhas por bloco ao ler o CSV: a memória de pico não depende do tamanho do arquivo
+CSV_CHUNK_ROWS = 100_000
+
+# Renomear colunas para formato mais legível
+COLUMN_RENAMES = {
+    'PoolQC': 'Pool QC',
+    'GrLivArea': 'Gr Liv Area',
+    'TotalBsmtSF': 'Total Bsmt SF',
+    'OverallQual': 'Overall Qual',
+    'BedroomAbvGr': 'Bedroom Abv Gr',
+    'FullBath': 'Full Bath'
+}
+
+# Variáveis categóricas do dataset (texto no CSV)
+CATEGORICAL_COLUMNS = [
+    'MS Zoning', 'Street', 'Alley', 'Lot Shape', 'Land Contour', 'Utilities',
+    'Lot Config', 'Land Slope', 'Neighborhood', 'Condition 1', 'Condition 2',
+    'Bldg Type', 'House Style', 'Roof Style', 'Roof Matl', 'Exterior 1st',
+    'Exterior 2nd', 'Mas Vnr Type', 'Exter Qual', 'Exter Cond', 'Foundation',
+    'Bsmt Qual', 'Bsmt Cond', 'Bsmt Exposure', 'BsmtFin Type 1', 'BsmtFin Type 2',
+    'Heating', 'Heating QC', 'Central Air', 'Electrical', 'Kitchen Qual',
+    'Functional', 'Fireplace Qu', 'Garage Type', 'Garage Finish', 'Garage Qual',
+    'Garage Cond', 'Paved Drive', 'Pool QC', 'Fence', 'Misc Feature',
+    'Sale Type', 'Sale Condition'
+]
+
+# Tipos numéricos reduzidos (colunas com valores ausentes ficam em float32)
+NUMERIC_DTYPES = {
+    'Order': 'int32',
+    'PID': 'int64',
+    'MS SubClass': 'int16',
+    'Lot Frontage': 'float32',
+    'Lot Area': 'int32',
+    'Overall Qual': 'int8',
+    'Overall Cond': 'int8',
+    'Year Built': 'int16',
+    'Year Remod/Add': 'int16',
+    'Mas Vnr Area': 'float32',
+    'BsmtFin SF 1': 'float32',
+    'BsmtFin SF 2': 'float32',
+    'Bsmt Unf SF': 'float32',
+    'Total Bsmt SF': 'float32',
+    '1st Flr SF': 'int16',
+    '2nd Flr SF': 'int16',
+    'Low Qual Fin SF': 'int16',
+    'Gr Liv Area': 'int16',
+    'Bsmt Full Bath': 'float32',
+    'Bsmt Half Bath': 'float32',
+    'Full Bath': 'int8',
+    'Half Bath': 'int8',
+    'Bedroom AbvGr': 'int8',
+    'Kitchen AbvGr': 'int8',
+    'TotRms AbvGrd': 'int8',
+    'Fireplaces': 'int8',
+    'Garage Yr Blt': 'float32',
+    'Garage Cars': 'float32',
+    'Garage Area': 'float32',
+    'Wood Deck SF': 'int16',
+    'Open Porch SF': 'int16',
+    'Enclosed Porch': 'int16',
+    '3Ssn Porch': 'int16',
+    'Screen Porch': 'int16',
+    'Pool Area': 'int16',
+    'Misc Val': 'int32',
+    'Mo Sold': 'int8',
+    'Yr Sold': 'int16',
+    'SalePrice': 'int32'
+}
+
+
+class Dataset(NamedTuple):
+    df: pd.DataFrame
+    version: str
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def csv_dtypes(path):
+    """Tipos explícitos (nomes originais do CSV) para as colunas presentes no arquivo."""
+    dtypes = {col: 'category' for col in CATEGORICAL_COLUMNS}
+    dtypes.update(NUMERIC_DTYPES)
+    header = pd.read_csv(path, nrows=0).columns
+    return {col: dtypes[COLUMN_RENAMES.get(col, col)] for col in header if COLUMN_RENAMES.get(col, col) in dtypes}
+
+
+def _cache_root(path):
+    return CACHE_DIR / 'datasets' / Path(path).stem
+
+
+def _codes_dtype(n_categories):
+    # Mesmo critério do pandas para os códigos de categorias
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _write_columns(path, target, chunk_rows=CSV_CHUNK_ROWS):
+    """Converte o CSV na cópia colunar lendo em blocos (nunca o arquivo inteiro).
+
+    Cada coluna é anexada a um arquivo bruto; categóricas recebem códigos
+    provisórios por ordem de aparição e, no fim, são recodificadas para as
+    categorias ordenadas (o mesmo resultado de `read_csv(dtype='category')`).
+    """
+    # Nome temporário por processo: workers podem reconstruir a cópia ao mesmo tempo
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    columns, dtypes, seen, raw = None, {}, {}, {}
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(path, dtype=csv_dtypes(path), chunksize=chunk_rows):
+            chunk = chunk.rename(columns=COLUMN_RENAMES)
+            if columns is None:
+                columns = list(chunk.columns)
+                raw = {col: open(tmp / f'{i}.raw', 'wb') for i, col in enumerate(columns)}
+            for col in columns:
+                series = chunk[col]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    mapping = seen.setdefault(col, {})
+                    lookup = np.array([mapping.setdefault(str(c), len(mapping)) for c in series.cat.categories]
+                                      + [-1], dtype=np.int32)
+                    # Código -1 (ausente) indexa o último elemento do lookup
+                    lookup[series.cat.codes.to_numpy()].tofile(raw[col])
+                else:
+                    values = series.to_numpy()
+                    dtype = dtypes.setdefault(col, values.dtype)
+                    if not np.can_cast(values.dtype, dtype, 'same_kind'):
+                        raise ValueError(f"Coluna '{col}' mudou de tipo ({dtype} -> {values.dtype}) no bloco {n_rows:,}")
+                    values.astype(dtype, copy=False).tofile(raw[col])
+            n_rows += len(chunk)
+    finally:
+        for f in raw.values():
+            f.close()
+
+    meta = []
+    for i, col in enumerate(columns):
+        source = tmp / f'{i}.raw'
+        if col in seen:
+            categories = sorted(seen[col])
+            remap = np.empty(len(categories) + 1, dtype=_codes_dtype(len(categories)))
+            remap[[seen[col][c] for c in categories]] = np.arange(len(categories))
+            remap[-1] = -1
+            values = np.memmap(source, dtype=np.int32, mode='r', shape=(n_rows,)) if n_rows else np.empty(0, np.int32)
+            out = np.lib.format.open_memmap(tmp / f'{i}.npy', mode='w+', dtype=remap.dtype, shape=(n_rows,))
+            for start in range(0, n_rows, chunk_rows):
+                out[start:start + chunk_rows] = remap[values[start:start + chunk_rows]]
+            meta.append({'name': col, 'kind': 'category', 'categories': categories})
+        else:
+            values = np.memmap(source, dtype=dtypes[col], mode='r', shape=(n_rows,)) if n_rows else np.empty(0, dtypes[col])
+            out = np.lib.format.open_memmap(tmp / f'{i}.npy', mode='w+', dtype=dtypes[col], shape=(n_rows,))
+            for start in range(0, n_rows, chunk_rows):
+                out[start:start + chunk_rows] = values[start:start + chunk_rows]
+            meta.append({'name': col, 'kind': 'numeric'})
+        out.flush()
+        del out, values
+        source.unlink()
+    with open(tmp / 'columns.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    if target.exists():
+        # Outro processo já gravou esta versão
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+    os.replace(tmp, target)
+
+
+def _read_columns(target):
+    # Arrays mapeados em memória: o sistema operacional compartilha as páginas
+    with open(target / 'columns.json', encoding='utf-8') as f:
+        columns = json.load(f)
+    data = {}
+    for i, meta in enumerate(columns):
+        values = np.load(target / f'{i}.npy', mmap_mode='r')
+        if meta['kind'] == 'category':
+            dtype = pd.CategoricalDtype(meta['categories'])
+            data[meta['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            data[meta['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def read_dataset(path=CSV_PATH):
+    """Carrega o dataset a partir da cópia colunar, recriando-a se o CSV mudou.
+
+    A cópia é invalidada pelo mtime/tamanho do CSV e, quando estes mudam,
+    confirmada pelo hash do conteúdo antes de reprocessar o arquivo.
+    """
+    path = Path(path)
+    root = _cache_root(path)
+    manifest_path = root / 'manifest.json'
+    stat = path.stat()
+
+    manifest = None
+    if manifest_path.exists():
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    fresh = (manifest is not None
+             and manifest['size'] == stat.st_size
+             and manifest['mtime_ns'] == stat.st_mtime_ns)
+    if not fresh:
+        sha = file_sha256(path)
+        version = sha[:16]
+        if manifest is None or manifest['sha256'] != sha or not (root / version).exists():
+            _write_columns(path, root / version)
+            # Remove versões antigas (mapeamentos abertos continuam válidos)
+            for old in root.iterdir():
+                if old.is_dir() and old.name != version and not old.name.endswith('.tmp'):
+                    shutil.rmtree(old, ignore_errors=True)
+        manifest = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                    'sha256': sha, 'version': version}
+        root.mkdir(parents=True, exist_ok=True)
+        tmp = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, manifest_path)
+
+    return Dataset(_read_columns(root / manifest['version']), manifest['version'])
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_dataset(path, size, mtime_ns):
+    return read_dataset(path)
+
+
+def load_dataset(path=CSV_PATH):
+    """Versão em cache de processo de `read_dataset`.
+
+    O DataFrame retornado é compartilhado entre sessões e deve ser tratado
+    como somente leitura.
+    """
+    stat = Path(path).stat()
+    return _cached_dataset(str(path), stat.st_size, stat.st_mtime_ns)
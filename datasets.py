@@ -0,0 +1,82 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from data import BASE_DIR, CSV_PATH, read_dataset
+
+# Um CSV por cidade (mesmo esquema do AmesHousing.csv): datasets/<Cidade>.csv
+CITIES_DIR = Path(os.environ.get('AMES_CITIES_DIR', BASE_DIR / 'datasets'))
+DEFAULT_CITY = 'Ames'
+# Orçamento de memória para cidades carregadas (MB), configurável por variável de ambiente
+MEMORY_BUDGET = int(os.environ.get('AMES_DATASET_MEMORY_MB', '2048')) * 1024 * 1024
+
+
+def discover_cities(cities_dir=CITIES_DIR):
+    cities = {DEFAULT_CITY: CSV_PATH}
+    if Path(cities_dir).is_dir():
+        for path in sorted(Path(cities_dir).glob('*.csv')):
+            cities.setdefault(path.stem, path)
+    return cities
+
+
+class DatasetRegistry:
+    """Datasets por cidade, carregados sob demanda e despejados por LRU.
+
+    Cada cidade é lida da cópia colunar mapeada em memória (`data.read_dataset`),
+    então sessões e processos do mesmo host compartilham as páginas do sistema
+    operacional em vez de manter um DataFrame próprio. Quando a soma dos
+    datasets carregados passa do orçamento, as cidades menos usadas saem.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_BUDGET, cities_dir=CITIES_DIR):
+        self.budget_bytes = budget_bytes
+        self.cities_dir = cities_dir
+        self._loaded = OrderedDict()
+        # O lock do registro só protege o dicionário; a leitura de cada cidade usa o seu
+        self._lock = threading.Lock()
+        self._city_locks = {}
+
+    def cities(self):
+        return list(discover_cities(self.cities_dir))
+
+    def loaded_bytes(self):
+        return sum(size for _, _, size in self._loaded.values())
+
+    def _cached(self, city, fingerprint):
+        with self._lock:
+            entry = self._loaded.get(city)
+            if entry is not None and entry[0] == fingerprint:
+                self._loaded.move_to_end(city)
+                return entry[1]
+            return None
+
+    def get(self, city):
+        path = discover_cities(self.cities_dir)[city]
+        stat = path.stat()
+        fingerprint = (stat.st_size, stat.st_mtime_ns)
+        dataset = self._cached(city, fingerprint)
+        if dataset is not None:
+            return dataset
+        with self._lock:
+            city_lock = self._city_locks.setdefault(city, threading.Lock())
+        # Sessões pedindo a mesma cidade esperam uma única leitura; as demais cidades seguem livres
+        with city_lock:
+            dataset = self._cached(city, fingerprint)
+            if dataset is not None:
+                return dataset
+            dataset = read_dataset(path)
+            size = int(dataset.df.memory_usage(index=False).sum())
+            with self._lock:
+                self._loaded[city] = (fingerprint, dataset, size)
+                self._loaded.move_to_end(city)
+                while len(self._loaded) > 1 and self.loaded_bytes() > self.budget_bytes:
+                    self._loaded.popitem(last=False)
+            return dataset
+
+
+@st.cache_resource(show_spinner=False)
+def get_registry():
+    return DatasetRegistry()
@@ -0,0 +1,255 @@
+"""Monitoramento de drift: quanto os imóveis avaliados se afastam do treino.
+
+Uso:
+    python drift.py datasets/Cidade.csv      # avalia um CSV contra o treino e registra o lote
+    python drift.py                          # resume o histórico registrado
+
+Os esboços são calculados sobre a matriz de entrada do modelo (a saída de
+`FeaturePipeline`) e sobre as previsões, então o lote do dashboard, o CSV da
+linha de comando e a API alimentam o mesmo monitor sem guardar as linhas:
+
+- numéricas e previsão: contagens em faixas fixas pelos decis do treino;
+- categóricas: contagem por código do treino, mais uma posição para categorias
+  nunca vistas.
+
+Esboços com as mesmas faixas se somam (mesclagem), e PSI e KS saem direto das
+contagens, com memória constante por variável. Cada lote registrado vira uma
+linha em `.cache/drift/<modelo>/batches.jsonl` com as contagens e os escores.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from batch import score_chunks
+from data import CACHE_DIR, read_dataset
+from model import load_or_train, production_params, split
+
+DRIFT_DIR = CACHE_DIR / 'drift'
+PREDICTION = 'Predicted SalePrice'
+QUANTILE_BINS = 10
+# Limiares usuais do PSI: < 0,1 estável, 0,1–0,25 moderado, > 0,25 significativo
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+PSI_EPSILON = 1e-4
+# A API registra um lote a cada FLUSH_ROWS linhas ou FLUSH_SECONDS segundos
+FLUSH_ROWS = int(os.environ.get('AMES_DRIFT_FLUSH_ROWS', '1000'))
+FLUSH_SECONDS = float(os.environ.get('AMES_DRIFT_FLUSH_SECONDS', '300'))
+
+
+class DriftSketch:
+    """Contagens por faixa (numéricas) ou por código (categóricas) de cada coluna monitorada.
+
+    `edges[col]` define as faixas das numéricas; `n_codes[col]` o número de
+    categorias do treino. A última posição das categóricas conta os códigos
+    NaN, isto é, categorias que o modelo nunca viu.
+    """
+
+    def __init__(self, columns, edges, n_codes, counts=None, rows=0):
+        self.columns = list(columns)
+        self.edges = {col: np.asarray(e, dtype=np.float64) for col, e in edges.items()}
+        self.n_codes = dict(n_codes)
+        self.counts = counts or {col: np.zeros(self._size(col), dtype=np.int64) for col in self.columns}
+        self.rows = rows
+
+    def _size(self, col):
+        return len(self.edges[col]) + 1 if col in self.edges else self.n_codes[col] + 1
+
+    @classmethod
+    def fit(cls, model, X, predictions):
+        """Faixas pelos decis do treino (sem repetições) e o esboço do próprio treino."""
+        pipeline = model.pipeline
+        edges, n_codes = {}, {}
+        quantiles = np.linspace(0, 1, QUANTILE_BINS + 1)[1:-1]
+        for j, col in enumerate(model.features):
+            if col in pipeline.categories:
+                n_codes[col] = len(pipeline.categories[col])
+            else:
+                edges[col] = np.unique(np.quantile(X[:, j], quantiles))
+        edges[PREDICTION] = np.unique(np.quantile(predictions, quantiles))
+        reference = cls(model.features + [PREDICTION], edges, n_codes)
+        reference.update(X, predictions)
+        return reference
+
+    def empty(self):
+        return DriftSketch(self.columns, self.edges, self.n_codes)
+
+    def _bins(self, col, values):
+        if col in self.edges:
+            return np.searchsorted(self.edges[col], values, side='right')
+        # Códigos inteiros; NaN (categoria desconhecida) vai para a última posição
+        return np.where(np.isnan(values), self.n_codes[col], values).astype(np.int64)
+
+    def update(self, X, predictions):
+        """Acumula um bloco da matriz do modelo (linhas × features) e suas previsões."""
+        for j, col in enumerate(self.columns):
+            values = predictions if col == PREDICTION else X[:, j]
+            self.counts[col] += np.bincount(self._bins(col, values), minlength=len(self.counts[col]))
+        self.rows += len(predictions)
+        return self
+
+    def merge(self, other):
+        for col in self.columns:
+            self.counts[col] += other.counts[col]
+        self.rows += other.rows
+        return self
+
+    def to_dict(self):
+        return {'columns': self.columns, 'rows': self.rows,
+                'edges': {col: e.tolist() for col, e in self.edges.items()},
+                'n_codes': self.n_codes,
+                'counts': {col: c.tolist() for col, c in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, spec):
+        counts = {col: np.asarray(c, dtype=np.int64) for col, c in spec['counts'].items()}
+        return cls(spec['columns'], spec['edges'], spec['n_codes'], counts, spec['rows'])
+
+    def with_counts(self, counts, rows):
+        # Esboço de um lote registrado (mesmas faixas da referência)
+        return DriftSketch(self.columns, self.edges, self.n_codes,
+                           {col: np.asarray(counts[col], dtype=np.int64) for col in self.columns}, rows)
+
+
+def _proportions(counts):
+    total = counts.sum()
+    return counts / total if total else np.zeros(len(counts))
+
+
+def psi(expected, actual):
+    """Population Stability Index entre duas contagens nas mesmas faixas."""
+    p = np.maximum(_proportions(expected), PSI_EPSILON)
+    q = np.maximum(_proportions(actual), PSI_EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks(expected, actual):
+    """Estatística KS nas bordas das faixas (limite inferior do KS exato)."""
+    return float(np.max(np.abs(np.cumsum(_proportions(expected)) - np.cumsum(_proportions(actual)))))
+
+
+def drift_scores(reference, sketch):
+    scores = {}
+    for col in reference.columns:
+        expected, actual = reference.counts[col], sketch.counts[col]
+        scores[col] = {'psi': psi(expected, actual)}
+        if col in reference.edges:
+            scores[col]['ks'] = ks(expected, actual)
+    return scores
+
+
+class DriftMonitor:
+    """Acumula lotes avaliados e registra seus esboços e escores no histórico.
+
+    `observe` pode ser chamado de várias threads (ex.: o executor da API); cada
+    origem ('lote', 'api', ...) tem seu esboço pendente, gravado por `flush`
+    ou automaticamente ao passar de `flush_rows` linhas ou `flush_seconds`.
+    """
+
+    def __init__(self, reference, root, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.reference = reference
+        self.root = Path(root)
+        self.log_path = self.root / 'batches.jsonl'
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def for_batch(self):
+        """Monitor próprio de um arquivo: mesma referência e histórico, um único lote no `flush`."""
+        return DriftMonitor(self.reference, self.root, flush_rows=float('inf'), flush_seconds=float('inf'))
+
+    def observe(self, X, predictions, source):
+        with self._lock:
+            sketch, started = self._pending.get(source) or (self.reference.empty(), time.time())
+            self._pending[source] = (sketch.update(X, predictions), started)
+            due = sketch.rows >= self.flush_rows or time.time() - started >= self.flush_seconds
+        if due:
+            self.flush(source)
+
+    def flush(self, source=None):
+        """Registra os esboços pendentes (de `source` ou de todas as origens)."""
+        with self._lock:
+            sources = [source] if source is not None else list(self._pending)
+            pending = [(s, self._pending.pop(s)[0]) for s in sources if s in self._pending]
+        return [self.record(sketch, s) for s, sketch in pending if sketch.rows]
+
+    def record(self, sketch, source):
+        scores = drift_scores(self.reference, sketch)
+        entry = {'time': time.time(), 'source': source, 'rows': sketch.rows,
+                 'psi': {col: s['psi'] for col, s in scores.items()},
+                 'ks': {col: s['ks'] for col, s in scores.items() if 'ks' in s},
+                 'counts': {col: c.tolist() for col, c in sketch.counts.items()}}
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        return entry
+
+    def history(self):
+        if not self.log_path.exists():
+            return []
+        with open(self.log_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def merged(self, entries):
+        """Esboço acumulado de vários lotes registrados (ex.: um dia ou todo o histórico)."""
+        total = self.reference.empty()
+        for entry in entries:
+            total.merge(self.reference.with_counts(entry['counts'], entry['rows']))
+        return total
+
+
+def load_or_fit_reference(model, df):
+    """Esboço do treino do modelo, salvo junto do histórico de drift."""
+    path = DRIFT_DIR / model.key / 'reference.json'
+    if path.exists():
+        with open(path, encoding='utf-8') as f:
+            return DriftSketch.from_dict(json.load(f))
+    train, _ = split(df)
+    X = model.encode(train)
+    reference = DriftSketch.fit(model, X, model.booster.inplace_predict(X))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'reference.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(reference.to_dict()), encoding='utf-8')
+    os.replace(tmp, path)
+    return reference
+
+
+def load_monitor(model, df, **kwargs):
+    return DriftMonitor(load_or_fit_reference(model, df), DRIFT_DIR / model.key, **kwargs)
+
+
+@st.cache_resource(show_spinner=False)
+def get_drift_monitor(model_key, _model, _df):
+    return load_monitor(_model, _df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('csv', type=Path, nargs='?')
+    args = parser.parse_args()
+
+    dataset = read_dataset()
+    model = load_or_train(dataset.df, dataset.version, production_params())
+    monitor = load_monitor(model, dataset.df).for_batch()
+    if args.csv is not None:
+        with open(args.csv, 'rb') as source:
+            for _ in score_chunks(model, source, monitor=monitor):
+                pass
+        monitor.flush()
+    history = monitor.history()
+    print(f"{len(history)} lotes registrados para o modelo {model.key}")
+    for entry in history[-10:]:
+        worst = sorted(entry['psi'].items(), key=lambda item: -item[1])[:3]
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['time']))} "
+              f"[{entry['source']}] {entry['rows']:,} linhas; maior PSI: "
+              + ', '.join(f'{col}={value:.3f}' for col, value in worst))
+
+
+if __name__ == '__main__':
+    main()
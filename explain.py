@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+import xgboost as xgb
+
+from model import MODEL_DIR
+
+EXPLANATION_CACHE_SIZE = 1024
+
+
+def compute_contributions(model, df, chunk_rows=50_000):
+    """Contribuições SHAP (TreeSHAP nativo do XGBoost) de todas as linhas; última coluna = viés."""
+    out = np.empty((len(df), len(model.features) + 1), dtype=np.float32)
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        dmatrix = xgb.DMatrix(model.encode(chunk))
+        out[start:start + len(chunk)] = model.booster.predict(dmatrix, pred_contribs=True)
+    return out
+
+
+def load_or_compute(model, df):
+    path = MODEL_DIR / model.key / 'contributions.npy'
+    if not path.exists():
+        tmp = path.with_suffix('.tmp.npy')
+        np.save(tmp, compute_contributions(model, df))
+        tmp.replace(path)
+    return np.load(path, mmap_mode='r')
+
+
+@st.cache_resource(show_spinner="Calculando as explicações do modelo...")
+def get_contributions(model_key, _model, _df):
+    # Uma passada em lote por versão do modelo; depois o arquivo é mapeado em memória
+    return load_or_compute(_model, _df)
+
+
+def global_importance(contributions, features):
+    """Participação de cada variável na média de |SHAP| (soma 1)."""
+    mean_abs = np.abs(contributions[:, :-1]).mean(axis=0)
+    importance = pd.DataFrame({'Feature': features, 'Importance': mean_abs / mean_abs.sum()})
+    return importance.sort_values('Importance', ascending=False, ignore_index=True)
+
+
+class ListingExplainer:
+    """Explicações sob demanda para imóveis avulsos, com cache LRU pela linha codificada."""
+
+    def __init__(self, model, maxsize=EXPLANATION_CACHE_SIZE):
+        self.model = model
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def explain(self, row):
+        row = np.ascontiguousarray(row, dtype=np.float32).reshape(1, -1)
+        key = row.tobytes()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        contributions = self.model.booster.predict(xgb.DMatrix(row), pred_contribs=True)[0]
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = contributions
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return contributions
+
+
+@st.cache_resource(show_spinner=False)
+def get_explainer(model_key, _model):
+    return ListingExplainer(_model)
+
+
+def waterfall_figure(contributions, features, title, top=10):
+    """Cascata do valor base até a previsão, com as `top` maiores contribuições."""
+    values = np.asarray(contributions[:-1], dtype=np.float64)
+    base = float(contributions[-1])
+    order = np.argsort(-np.abs(values))
+    shown, rest = order[:top], order[top:]
+    labels = ['Valor base'] + [features[i] for i in shown]
+    deltas = [base] + [values[i] for i in shown]
+    measures = ['absolute'] + ['relative'] * len(shown)
+    if len(rest):
+        labels.append(f'Outras {len(rest)} variáveis')
+        deltas.append(values[rest].sum())
+        measures.append('relative')
+    labels.append('Previsão')
+    deltas.append(base + values.sum())
+    measures.append('total')
+
+    fig = go.Figure(go.Waterfall(
+        orientation='v', x=labels, y=deltas, measure=measures,
+        text=[f'${d:,.0f}' for d in deltas], textposition='outside',
+        increasing={'marker': {'color': '#1e90ff'}},
+        decreasing={'marker': {'color': '#ff0000'}},
+        totals={'marker': {'color': '#1e3a8a'}}
+    ))
+    fig.update_layout(title=title)
+    return fig
@@ -0,0 +1,272 @@
+"""Artefato compacto do modelo: árvores podadas em UBJSON e inferência por vetores de nós.
+
+Uso:
+    python export.py                 # poda, grava e compara com o booster original
+    python export.py --rows 100000   # lote maior na medição de previsões/s
+    python export.py --promote       # também torna o modelo podado o de produção
+
+A poda usa validação cruzada com parada antecipada nas linhas de treino (como
+`tuning.py`) para achar quantas rodadas o modelo realmente precisa, e fatia o
+booster já treinado nesse ponto: as árvores restantes são as mesmas, sem
+retreino. O modelo podado é gravado com os parâmetros de `n_estimators`
+reduzido, ou seja, com uma chave própria: explicações, resíduos, drift,
+métricas e figuras em cache do modelo original não são reaproveitados. Só
+com --promote esses parâmetros vão para `best_params.json` (substituindo os
+promovidos por `tuning.py`), marcados com a origem: export e chave do modelo
+de onde veio a poda.
+
+`TreeArrays` achata todas as árvores em vetores de nós (filho, variável,
+limiar, valor) e percorre todas as árvores de um bloco de linhas ao mesmo
+tempo, um nível por passo; os blocos são divididos entre os núcleos. Em CPU é
+mais lento que o `inplace_predict` do XGBoost (de 2,5 a 4,5 vezes num núcleo,
+em qualquer tamanho de bloco): o caminho rápido de previsão é o booster podado
+em `model.ubj`. Os vetores servem onde o XGBoost não pode ser carregado e para
+partida a frio (carga em ~1 ms, mapeados em memória).
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import xgboost as xgb
+
+from data import read_dataset
+from model import (BEST_PARAMS_PATH, MODEL_DIR, PROMOTION_SOURCE, TARGET, PriceModel, load_or_train,
+                   model_key, production_params, save_model, split)
+from preprocessing import inconsistent_rows
+from tuning import EARLY_STOPPING_ROUNDS
+
+TREE_ARRAYS = ['left', 'feature', 'threshold', 'default_left', 'value', 'roots']
+CV_FOLDS = 5
+# Linhas por bloco: os índices de nó de um bloco (linhas × árvores) cabem no cache
+BLOCK_ROWS = 64
+
+
+class TreeArrays:
+    """Booster achatado em vetores de nós para inferência só com NumPy (mais lenta que o booster).
+
+    O XGBoost aloca os dois filhos de cada nó em sequência, então basta guardar
+    o filho da esquerda: o da direita é o seguinte. Folhas apontam para si
+    mesmas com limiar +inf, de modo que ficam paradas nos níveis que sobram.
+    """
+
+    def __init__(self, left, feature, threshold, default_left, value, roots, base_score, depth):
+        self.left = left
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_score = base_score
+        self.depth = depth
+        # Pools reaproveitados entre chamadas (um por número de threads)
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+    @classmethod
+    def from_booster(cls, booster):
+        dump = json.loads(booster.save_raw('json'))
+        learner = dump['learner']
+        trees = learner['gradient_booster']['model']['trees']
+        base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        sizes = np.array([len(tree['left_children']) for tree in trees])
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        left = np.concatenate([tree['left_children'] for tree in trees]).astype(np.int64)
+        right = np.concatenate([tree['right_children'] for tree in trees]).astype(np.int64)
+        shift = np.repeat(offsets[:-1], sizes)
+        nodes = np.arange(offsets[-1])
+        leaf = left < 0
+        if np.any(right[~leaf] != left[~leaf] + 1):
+            raise ValueError("Filhos fora de sequência: formato de árvore não suportado")
+        if any(any(tree.get('split_type', [])) for tree in trees):
+            raise ValueError("Divisões categóricas não são suportadas")
+        conditions = np.concatenate([tree['split_conditions'] for tree in trees]).astype(np.float32)
+        arrays = {
+            'left': np.where(leaf, nodes, left + shift).astype(np.int32),
+            'feature': np.where(leaf, 0, np.concatenate([tree['split_indices'] for tree in trees])).astype(np.int32),
+            'threshold': np.where(leaf, np.float32(np.inf), conditions).astype(np.float32),
+            'default_left': np.where(leaf, True, np.concatenate([tree['default_left'] for tree in trees]).astype(bool)),
+            'value': np.where(leaf, conditions, np.float32(0)).astype(np.float32),
+            'roots': offsets[:-1].astype(np.int32),
+        }
+        return cls(**arrays, base_score=base_score, depth=cls._max_depth(arrays['left'], leaf, arrays['roots']))
+
+    @staticmethod
+    def _max_depth(left, leaf, roots):
+        # Desce nível a nível a partir das raízes até sobrarem só folhas
+        depth, frontier = 0, roots
+        while True:
+            inner = frontier[~leaf[frontier]]
+            if not len(inner):
+                return depth
+            frontier = np.concatenate([left[inner], left[inner] + 1])
+            depth += 1
+
+    def _predict_block(self, X):
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        # Posição de cada linha no vetor achatado, repetida para todas as árvores
+        base = (np.arange(n_rows, dtype=np.int32) * np.int32(n_features))[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+        # Sem ausentes no bloco (o caso comum), a direção padrão nunca é consultada
+        missing = bool(np.isnan(flat).any())
+        for _ in range(self.depth):
+            x = np.take(flat, base + np.take(self.feature, node))
+            go_left = x < np.take(self.threshold, node)
+            if missing:
+                go_left = np.where(np.isnan(x), np.take(self.default_left, node), go_left)
+            node = np.take(self.left, node) + ~go_left
+        return np.take(self.value, node).sum(axis=1, dtype=np.float64) + self.base_score
+
+    def _pool(self, workers):
+        with self._pools_lock:
+            pool = self._pools.get(workers)
+            if pool is None:
+                pool = self._pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='trees')
+            return pool
+
+    def predict(self, X, workers=None, block_rows=BLOCK_ROWS):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if len(X) <= block_rows:
+            return self._predict_block(X) if len(X) else np.empty(0)
+        blocks = [X[start:start + block_rows] for start in range(0, len(X), block_rows)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            parts = [self._predict_block(block) for block in blocks]
+        else:
+            # np.take e as comparações liberam o GIL: os blocos rodam em paralelo
+            parts = list(self._pool(workers).map(self._predict_block, blocks))
+        return np.concatenate(parts)
+
+    def save(self, target):
+        target.mkdir(parents=True, exist_ok=True)
+        for name in TREE_ARRAYS:
+            np.save(target / f'{name}.npy', getattr(self, name))
+        with open(target / 'tree_meta.json', 'w', encoding='utf-8') as f:
+            json.dump({'base_score': self.base_score, 'depth': self.depth}, f)
+
+    @classmethod
+    def load(cls, target):
+        with open(target / 'tree_meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(target / f'{name}.npy', mmap_mode='r') for name in TREE_ARRAYS}
+        return cls(**arrays, **meta)
+
+
+def native_params(params):
+    """Parâmetros do XGBRegressor no formato de `xgb.train`/`xgb.cv`."""
+    native = {'objective': 'reg:squarederror', 'tree_method': 'hist', 'eval_metric': 'rmse',
+              'seed': params.get('random_state', 0)}
+    native.update({k: v for k, v in params.items() if k not in ('n_estimators', 'random_state')})
+    return native
+
+
+def best_rounds(model, df, folds=CV_FOLDS):
+    """Rodadas até a parada antecipada na validação cruzada do treino (no máximo as do booster)."""
+    train, _ = split(df)
+    train = train[~inconsistent_rows(train)[0]]
+    dtrain = xgb.DMatrix(model.encode(train), train[TARGET].to_numpy(dtype=np.float32))
+    history = xgb.cv(native_params(model.params), dtrain, num_boost_round=model.booster.num_boosted_rounds(),
+                     nfold=folds, early_stopping_rounds=EARLY_STOPPING_ROUNDS, seed=model.params.get('random_state', 0))
+    return len(history)
+
+
+def export_model(model, df, rounds=None):
+    """Modelo podado, salvo (`model.ubj` e vetores de nós) na pasta da sua própria chave.
+
+    O modelo original e seus artefatos ficam intactos.
+    """
+    original = model.booster.num_boosted_rounds()
+    rounds = min(rounds or best_rounds(model, df), original)
+    params = dict(model.params, n_estimators=rounds)
+    meta = dict(model.meta, key=model_key(model.meta['data_version'], params), params=params,
+                export={'rounds': rounds, 'original_rounds': original, 'source': model.key})
+    pruned = PriceModel(model.booster[:rounds], meta, model.pipeline)
+    save_model(pruned)
+    TreeArrays.from_booster(pruned.booster).save(MODEL_DIR / pruned.key / 'trees')
+    return pruned
+
+
+def promote(model, path=BEST_PARAMS_PATH):
+    """Torna `model` o modelo de produção: `production_params()` passa a apontar para a sua chave."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**model.params, PROMOTION_SOURCE: {'tool': 'export', 'model': model.key, **model.meta['export']}},
+                  f, indent=2)
+
+
+def load_tree_arrays(model):
+    """Vetores de nós exportados do modelo (ou montados a partir do booster carregado)."""
+    target = MODEL_DIR / model.key / 'trees'
+    if (target / 'tree_meta.json').exists():
+        return TreeArrays.load(target)
+    return TreeArrays.from_booster(model.booster)
+
+
+def _load_booster(path):
+    booster = xgb.Booster()
+    booster.load_model(str(path))
+    return booster
+
+
+def _timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=None, help="rodadas mantidas (padrão: parada antecipada)")
+    parser.add_argument('--rows', type=int, default=50_000, help="linhas do lote de medição")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--promote', action='store_true',
+                        help="grava best_params.json para que o modelo podado seja o de produção")
+    args = parser.parse_args()
+
+    dataset = read_dataset()
+    original = load_or_train(dataset.df, dataset.version, production_params())
+    stock = xgb.Booster()
+    stock.load_model(bytearray(original.booster.save_raw('json')))
+    stock_path = MODEL_DIR / original.key / 'stock.json'
+    stock.save_model(str(stock_path))
+
+    model = export_model(original, dataset.df, args.rounds)
+    target = MODEL_DIR / model.key
+    export = model.meta['export']
+    print(f"Rodadas: {export['original_rounds']} → {export['rounds']} (modelo {model.key})")
+    if args.promote:
+        promote(model)
+        print(f"Parâmetros de produção gravados em {BEST_PARAMS_PATH}")
+
+    X = model.encode(dataset.df.sample(args.rows, replace=True, random_state=0))
+    trees = load_tree_arrays(model)
+    pruned = model.booster.inplace_predict(X)
+    # (artefato, caminho, carga, previsão, previsões de referência para a diferença)
+    report = [
+        ('booster original (JSON)', stock_path, lambda: _load_booster(stock_path), stock.inplace_predict,
+         stock.inplace_predict(X)),
+        ('booster podado (UBJSON)', target / 'model.ubj', lambda: _load_booster(target / 'model.ubj'),
+         model.booster.inplace_predict, pruned),
+        ('vetores de nós (NumPy)', target / 'trees', lambda: TreeArrays.load(target / 'trees'),
+         lambda X: trees.predict(X, workers=args.workers), pruned),
+    ]
+    print(f"{'artefato':<26}{'tamanho':>10}{'carga':>10}{'previsões/s':>14}{'dif. máx.':>12}")
+    for name, path, load, predict, reference in report:
+        size = sum(p.stat().st_size for p in path.iterdir()) if path.is_dir() else path.stat().st_size
+        load_s, _ = _timed(load)
+        predict_s, predictions = _timed(lambda: predict(X))
+        print(f"{name:<26}{size / 1024:>8.0f}KB{load_s * 1000:>8.1f}ms{len(X) / predict_s:>14,.0f}"
+              f"{np.max(np.abs(predictions - reference)):>12.2f}")
+    print(f"Diferença máxima entre o booster original e o podado: ${np.max(np.abs(report[0][4] - pruned)):,.0f}")
+    stock_path.unlink()
+
+
+if __name__ == '__main__':
+    main()
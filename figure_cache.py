@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+from result_store import content_key, get_result_store
+
+# Limites do cache de figuras (compartilhado entre sessões do processo)
+MAX_BYTES = 128 * 1024 * 1024
+MAX_ENTRIES = 512
+
+
+class FigureCache:
+    """Cache LRU de figuras Plotly com teto de memória.
+
+    A chave combina versão do dataset, filtros e seleções de eixos; o tamanho
+    de cada entrada é medido pelo JSON serializado da figura. Guardamos o
+    próprio objeto Figure, já que o `st.plotly_chart` revalida dicionários e
+    reconstruí-los custaria quase o mesmo que montar a figura de novo.
+
+    Com `store`, o JSON de cada figura também vai para o cache em disco
+    compartilhado (L2): outros processos e reinícios o reaproveitam.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES, store=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, fig, spec=None):
+        spec = spec or pio.to_json(fig, validate=False)
+        size = len(spec)
+        if size > self.max_bytes:
+            return fig
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (fig, size)
+            self.bytes += size
+            while self._entries and (self.bytes > self.max_bytes
+                                     or len(self._entries) > self.max_entries):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return fig
+
+    def get_or_build(self, key, build):
+        fig = self.get(key)
+        if fig is not None:
+            return fig
+        if self.store is None:
+            return self.put(key, build())
+        store_key = content_key('figure', *key)
+        spec = self.store.get_bytes(store_key)
+        if spec is not None:
+            spec = spec.decode('utf-8')
+            return self.put(key, pio.from_json(spec, skip_invalid=True), spec)
+        fig = build()
+        spec = pio.to_json(fig, validate=False)
+        self.store.put_bytes(store_key, spec.encode('utf-8'))
+        return self.put(key, fig, spec)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return FigureCache(store=get_result_store())
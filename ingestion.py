@@ -0,0 +1,161 @@
+"""Agregados acumulados em blocos a partir da cópia colunar, para a Visão Geral.
+
+Uso:
+    python ingestion.py datasets/Cidade.csv
+
+A cópia colunar (`data.read_dataset`) já é lida do CSV em blocos e mapeada em
+memória; aqui ela é percorrida de novo em blocos para acumular o que a Visão
+Geral precisa (histograma de preços, limites dos filtros, contagens por
+qualidade) sem materializar o recorte. Os agregados ficam salvos em
+`.cache/summary/<versão>.npz`.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from data import CACHE_DIR, CSV_CHUNK_ROWS, read_dataset
+
+SUMMARY_DIR = CACHE_DIR / 'summary'
+PRICE_BUCKET = 1_000            # largura (USD) das faixas finas do histograma acumulado
+SUMMARY_COLUMNS = ['SalePrice', 'Gr Liv Area', 'Overall Qual']
+
+
+class StreamSummary:
+    """Agregados acumulados bloco a bloco numa grade qualidade × faixa de preço.
+
+    Cada célula guarda contagem e somas, então qualquer combinação dos filtros
+    de preço/qualidade é respondida somando células, sem reler as linhas. O
+    preço é agrupado em faixas de PRICE_BUCKET dólares; as bordas do filtro de
+    preço são arredondadas para a faixa. As duas dimensões crescem conforme os
+    blocos trazem qualidades e preços maiores.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.price_min = self.price_max = None
+        self.quality_min = self.quality_max = None
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.sums = {col: np.zeros((0, 0)) for col in SUMMARY_COLUMNS}
+
+    def _grow(self, n_qualities, n_buckets):
+        extra = (max(n_qualities - self.counts.shape[0], 0), max(n_buckets - self.counts.shape[1], 0))
+        if any(extra):
+            pad = ((0, extra[0]), (0, extra[1]))
+            self.counts = np.pad(self.counts, pad)
+            self.sums = {col: np.pad(s, pad) for col, s in self.sums.items()}
+
+    def update(self, chunk):
+        prices = chunk['SalePrice'].to_numpy(dtype=np.float64)
+        qualities = chunk['Overall Qual'].to_numpy(dtype=np.int64)
+        if not len(prices):
+            return
+        buckets = (prices // PRICE_BUCKET).astype(np.int64)
+        self._grow(int(qualities.max()) + 1, int(buckets.max()) + 1)
+        cells = qualities * self.counts.shape[1] + buckets
+        size = self.counts.size
+        self.counts += np.bincount(cells, minlength=size).reshape(self.counts.shape)
+        for col in SUMMARY_COLUMNS:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+            self.sums[col] += np.bincount(cells[valid], weights=values[valid], minlength=size).reshape(self.counts.shape)
+        self.rows += len(prices)
+        self.price_min = min(prices.min(), self.price_min if self.price_min is not None else np.inf)
+        self.price_max = max(prices.max(), self.price_max if self.price_max is not None else -np.inf)
+        self.quality_min = min(int(qualities.min()), self.quality_min if self.quality_min is not None else np.inf)
+        self.quality_max = max(int(qualities.max()), self.quality_max if self.quality_max is not None else -np.inf)
+
+    def _cells(self, price_range, quality_range):
+        lo = max(int(price_range[0] // PRICE_BUCKET), 0)
+        hi = min(int(price_range[1] // PRICE_BUCKET) + 1, self.counts.shape[1])
+        q_lo, q_hi = max(int(quality_range[0]), 0), min(int(quality_range[1]) + 1, self.counts.shape[0])
+        return slice(q_lo, q_hi), slice(lo, hi)
+
+    def quality_counts(self):
+        return self.counts.sum(axis=1)
+
+    def query(self, price_range, quality_range):
+        cells = self._cells(price_range, quality_range)
+        rows = int(self.counts[cells].sum())
+        result = {'rows': rows}
+        for col, sums in self.sums.items():
+            total = float(sums[cells].sum())
+            result[col] = {'count': rows, 'sum': total, 'mean': total / rows if rows else float('nan')}
+        return result
+
+    def histogram(self, price_range, quality_range, bins=50):
+        """Contagens em ~`bins` faixas (múltiplos de PRICE_BUCKET) dentro dos filtros."""
+        q_cells, p_cells = self._cells(price_range, quality_range)
+        counts = self.counts[q_cells, p_cells].sum(axis=0)
+        width = max(int(np.ceil(len(counts) / bins)), 1)
+        counts = np.pad(counts, (0, -len(counts) % width)).reshape(-1, width).sum(axis=1)
+        edges = (p_cells.start + np.arange(len(counts) + 1) * width) * PRICE_BUCKET
+        return edges, counts
+
+    def to_arrays(self):
+        arrays = {'counts': self.counts,
+                  'bounds': np.array([self.rows, self.price_min, self.price_max,
+                                      self.quality_min, self.quality_max], dtype=np.float64)}
+        arrays.update({f'sum_{col}': s for col, s in self.sums.items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        summary = cls()
+        summary.counts = arrays['counts']
+        summary.sums = {col: arrays[f'sum_{col}'] for col in SUMMARY_COLUMNS}
+        rows, price_min, price_max, quality_min, quality_max = arrays['bounds']
+        summary.rows = int(rows)
+        summary.price_min, summary.price_max = price_min, price_max
+        summary.quality_min, summary.quality_max = int(quality_min), int(quality_max)
+        return summary
+
+
+def summarize(df, chunk_rows=CSV_CHUNK_ROWS):
+    """Agregados de `df`, acumulados bloco a bloco."""
+    summary = StreamSummary()
+    for start in range(0, len(df), chunk_rows):
+        summary.update(df.iloc[start:start + chunk_rows])
+    return summary
+
+
+def save_summary(summary, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+    np.savez(tmp, **summary.to_arrays())
+    os.replace(tmp, path)
+
+
+def load_or_summarize(data_version, df):
+    path = SUMMARY_DIR / f'{data_version}.npz'
+    if path.exists():
+        with np.load(path) as arrays:
+            return StreamSummary.from_arrays(dict(arrays))
+    summary = summarize(df)
+    save_summary(summary, path)
+    return summary
+
+
+@st.cache_resource(show_spinner=False)
+def get_summary(data_version, _df):
+    return load_or_summarize(data_version, _df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('csv', type=Path)
+    args = parser.parse_args()
+
+    df, version = read_dataset(args.csv)
+    summary = load_or_summarize(version, df)
+    print(f"{summary.rows:,} imóveis ({SUMMARY_DIR / f'{version}.npz'})")
+    print(f"Preço: ${summary.price_min:,.0f} – ${summary.price_max:,.0f}; "
+          f"qualidade {summary.quality_min}–{summary.quality_max}")
+    counts = summary.quality_counts()
+    print("Imóveis por qualidade: " + ', '.join(f'{q}: {n:,}' for q, n in enumerate(counts) if n))
+
+
+if __name__ == '__main__':
+    main()
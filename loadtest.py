@@ -0,0 +1,105 @@
+"""Teste de carga da API de previsão (api.py).
+
+Uso:
+    uvicorn api:app --port 8000 &
+    python loadtest.py --url http://127.0.0.1:8000/predict --concurrency 64 --requests 5000
+
+Cada conexão mantém keep-alive e envia imóveis reais do AmesHousing.csv.
+Ao final, imprime latência p50/p90/p99, vazão (requisições/s) e erros.
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from data import CSV_PATH
+from model import FEATURES
+
+
+def sample_payloads(n, batch_size, seed=0):
+    df = pd.read_csv(CSV_PATH, usecols=FEATURES)
+    records = df.sample(n * batch_size, replace=True, random_state=seed).to_dict('records')
+    # NaN não é JSON válido: campos ausentes ficam de fora e a API imputa
+    records = [{k: v for k, v in r.items() if not pd.isna(v)} for r in records]
+    if batch_size == 1:
+        return [json.dumps({'listing': r}).encode('utf-8') for r in records]
+    return [json.dumps({'listings': records[i:i + batch_size]}).encode('utf-8')
+            for i in range(0, len(records), batch_size)]
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _worker(host, port, path, payloads, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while payloads:
+            body = payloads.pop()
+            request = (f'POST {path} HTTP/1.1\r\nHost: {host}\r\n'
+                       f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n')
+            start = time.perf_counter()
+            writer.write(request.encode('latin-1') + body)
+            await writer.drain()
+            statuses.append(await _read_response(reader))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, n_requests, batch_size):
+    parts = urlsplit(url)
+    payloads = sample_payloads(n_requests, batch_size)
+    latencies, statuses = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(parts.hostname, parts.port or 80, parts.path, payloads, latencies, statuses)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    statuses = np.array(statuses)
+    return {
+        'requests': len(latencies),
+        'rows_per_request': batch_size,
+        'seconds': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'rows_per_second': len(latencies) * batch_size / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p90_ms': float(np.percentile(latencies, 90)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'errors': int((statuses != 200).sum()),
+        'rejected_503': int((statuses == 503).sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000/predict')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="imóveis por requisição (>1 usa o formato de /predict/batch)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.url, args.concurrency, args.requests, args.batch_size))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import streamlit as st
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from data import CACHE_DIR
+from preprocessing import INCONSISTENCY_RULES, NONE_CATEGORY_COLUMNS, FeaturePipeline, inconsistent_rows
+from result_store import content_key, get_result_store
+
+MODEL_DIR = CACHE_DIR / 'models'
+# Configuração promovida pela busca de hiperparâmetros (tuning.py)
+BEST_PARAMS_PATH = CACHE_DIR / 'tuning' / 'best_params.json'
+# Chave de best_params.json com a origem da promoção (tuning.py ou export.py); não é parâmetro
+PROMOTION_SOURCE = '_source'
+
+# 36 variáveis selecionadas (feature importance + remoção de redundâncias)
+NUMERIC_FEATURES = [
+    'Overall Qual', 'Gr Liv Area', 'Total Bsmt SF', 'Year Built', 'Full Bath',
+    'Garage Cars', '1st Flr SF', 'Year Remod/Add', 'Lot Area', 'Lot Frontage',
+    'Mas Vnr Area', 'BsmtFin SF 1', 'Fireplaces', 'Overall Cond', 'Wood Deck SF',
+    'Open Porch SF', 'Half Bath', 'TotRms AbvGrd', 'Bsmt Full Bath',
+    'Screen Porch', 'Bedroom AbvGr', 'Kitchen AbvGr', 'MS SubClass'
+]
+CATEGORICAL_FEATURES = [
+    'Neighborhood', 'MS Zoning', 'Exter Qual', 'Kitchen Qual', 'Bsmt Qual',
+    'Bsmt Exposure', 'Fireplace Qu', 'Garage Finish', 'Garage Type',
+    'Central Air', 'Sale Condition', 'Sale Type', 'Foundation'
+]
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+TARGET = 'SalePrice'
+
+# Conjunto de treino: 1460 primeiros registros; o restante é teste
+TRAIN_ROWS = 1460
+
+MODEL_PARAMS = {
+    'learning_rate': 0.05,
+    'max_depth': 5,
+    'n_estimators': 1000,
+    'subsample': 0.8,
+    'random_state': 42,
+}
+
+
+class PriceModel:
+    """Booster XGBoost e o pipeline de features ajustado no mesmo treino."""
+
+    def __init__(self, booster, meta, pipeline):
+        self.booster = booster
+        self.meta = meta
+        self.pipeline = pipeline
+        self.key = meta['key']
+        self.params = meta['params']
+        self.features = pipeline.features
+
+    def encode(self, df, out=None):
+        return self.pipeline.transform(df, out=out)
+
+    def predict(self, df):
+        return self.booster.inplace_predict(self.encode(df))
+
+
+def model_key(data_version, params=None):
+    payload = {
+        'data': data_version,
+        'params': params or MODEL_PARAMS,
+        'features': FEATURES,
+        'train_rows': TRAIN_ROWS,
+        'none_categories': NONE_CATEGORY_COLUMNS,
+        'consistency_rules': sorted(INCONSISTENCY_RULES),
+    }
+    blob = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def split(df):
+    return df.iloc[:TRAIN_ROWS], df.iloc[TRAIN_ROWS:]
+
+
+def train_model(df, data_version, params=None):
+    params = dict(params or MODEL_PARAMS)
+    train, _ = split(df)
+    inconsistent, violations = inconsistent_rows(train)
+    train = train[~inconsistent]
+    meta = {'key': model_key(data_version, params), 'data_version': data_version,
+            'params': params, 'train_rows': TRAIN_ROWS, 'dropped_rows': violations}
+
+    model = PriceModel(None, meta, FeaturePipeline.fit(train, NUMERIC_FEATURES, CATEGORICAL_FEATURES))
+    regressor = xgb.XGBRegressor(tree_method='hist', **params)
+    regressor.fit(model.encode(train), train[TARGET].to_numpy(dtype=np.float32))
+    model.booster = regressor.get_booster()
+    return model
+
+
+def save_model(model):
+    target = MODEL_DIR / model.key
+    tmp = target.with_name(target.name + '.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    model.booster.save_model(str(tmp / 'model.ubj'))
+    model.pipeline.save(tmp / 'pipeline.json')
+    with open(tmp / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(model.meta, f, ensure_ascii=False)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def read_model(key):
+    target = MODEL_DIR / key
+    if not (target / 'pipeline.json').exists():
+        return None
+    with open(target / 'meta.json', encoding='utf-8') as f:
+        meta = json.load(f)
+    # UBJSON (binário, menor e mais rápido de carregar); JSON só em artefatos antigos
+    booster = xgb.Booster()
+    ubj = target / 'model.ubj'
+    booster.load_model(str(ubj if ubj.exists() else target / 'model.json'))
+    return PriceModel(booster, meta, FeaturePipeline.load(target / 'pipeline.json'))
+
+
+def load_or_train(df, data_version, params=None):
+    """Carrega o booster persistido para (dados, parâmetros) ou treina e salva um novo."""
+    model = read_model(model_key(data_version, params))
+    if model is None:
+        model = train_model(df, data_version, params)
+        save_model(model)
+    return model
+
+
+def production_params():
+    """Parâmetros documentados, substituídos pelos promovidos (`tuning.py` ou `export.py`) se existirem."""
+    params = dict(MODEL_PARAMS)
+    if BEST_PARAMS_PATH.exists():
+        with open(BEST_PARAMS_PATH, encoding='utf-8') as f:
+            promoted = json.load(f)
+        params.update({k: v for k, v in promoted.items() if k != PROMOTION_SOURCE})
+    return params
+
+
+@st.cache_resource(show_spinner="Carregando o modelo preditivo...")
+def _cached_model(data_version, params_json, _df):
+    return load_or_train(_df, data_version, json.loads(params_json))
+
+
+def get_model(data_version, df):
+    params_json = json.dumps(production_params(), sort_keys=True)
+    return _cached_model(data_version, params_json, df)
+
+
+def regression_metrics(y_true, y_pred):
+    return {
+        'r2': float(r2_score(y_true, y_pred)),
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'mean_error': float(np.mean(np.asarray(y_true, dtype=np.float64) - y_pred)),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def evaluate_model(model_key, _model, _df):
+    """Métricas de treino e teste calculadas a partir do booster carregado."""
+    def compute():
+        train, test = split(_df)
+        return {
+            'train': regression_metrics(train[TARGET].to_numpy(), _model.predict(train)),
+            'test': regression_metrics(test[TARGET].to_numpy(), _model.predict(test)),
+        }
+
+    # A chave do modelo já identifica dados, parâmetros e features
+    return get_result_store().get_or_compute(content_key('metrics', model_key), compute)
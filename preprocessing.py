@@ -0,0 +1,194 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from data import CATEGORICAL_COLUMNS, COLUMN_RENAMES
+
+# Variáveis categóricas em que NA significa "não possui" (ex.: sem garagem)
+NONE_CATEGORY_COLUMNS = [
+    'Alley', 'Mas Vnr Type', 'Bsmt Qual', 'Bsmt Cond', 'Bsmt Exposure',
+    'BsmtFin Type 1', 'BsmtFin Type 2', 'Fireplace Qu', 'Garage Type',
+    'Garage Finish', 'Garage Qual', 'Garage Cond', 'Pool QC', 'Fence',
+    'Misc Feature'
+]
+NONE_CATEGORY = 'None'
+
+
+def read_csv_chunks(source, chunk_rows):
+    """Lê um CSV no esquema do AmesHousing em blocos, já com as categóricas tipadas."""
+    header = pd.read_csv(source, nrows=0).rename(columns=COLUMN_RENAMES).columns
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    original = {v: k for k, v in COLUMN_RENAMES.items()}
+    dtypes = {original.get(col, col): 'category' for col in CATEGORICAL_COLUMNS if col in header}
+    for chunk in pd.read_csv(source, dtype=dtypes, chunksize=chunk_rows):
+        yield chunk.rename(columns=COLUMN_RENAMES)
+
+
+def fill_none_categories(df):
+    """Converte NA em 'None' nas 15 categóricas onde NA é uma categoria."""
+    filled = {}
+    for col in NONE_CATEGORY_COLUMNS:
+        if col not in df.columns or not df[col].isna().any():
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            if NONE_CATEGORY not in series.cat.categories:
+                series = series.cat.add_categories(NONE_CATEGORY)
+        filled[col] = series.fillna(NONE_CATEGORY)
+    if not filled:
+        return df
+    return df.assign(**filled)
+
+
+# Registros internamente inconsistentes (erros de digitação ou vendas atípicas):
+# ficam fora do ajuste do modelo. Cada regra é uma comparação vetorizada entre
+# colunas; regras cujas colunas não existem no quadro são ignoradas.
+INCONSISTENCY_RULES = {
+    'reforma antes da construção': (
+        ['Year Remod/Add', 'Year Built'],
+        lambda df: df['Year Remod/Add'] < df['Year Built']),
+    'venda antes da construção': (
+        ['Yr Sold', 'Year Built'],
+        lambda df: df['Yr Sold'] < df['Year Built']),
+    'garagem construída após a venda': (
+        ['Garage Yr Blt', 'Yr Sold'],
+        lambda df: df['Garage Yr Blt'] > df['Yr Sold'] + 1),
+    'porão diferente da soma das partes': (
+        ['BsmtFin SF 1', 'BsmtFin SF 2', 'Bsmt Unf SF', 'Total Bsmt SF'],
+        lambda df: (df['BsmtFin SF 1'] + df['BsmtFin SF 2'] + df['Bsmt Unf SF'] - df['Total Bsmt SF']).abs() > 1),
+    'área habitável diferente da soma dos pavimentos': (
+        ['1st Flr SF', '2nd Flr SF', 'Low Qual Fin SF', 'Gr Liv Area'],
+        lambda df: (df['1st Flr SF'] + df['2nd Flr SF'] + df['Low Qual Fin SF'] - df['Gr Liv Area']).abs() > 1),
+    'garagem com área e sem vagas': (
+        ['Garage Cars', 'Garage Area'],
+        lambda df: (df['Garage Cars'] == 0) & (df['Garage Area'] > 0)),
+    # As vendas parciais enormes e baratas documentadas por De Cock (2011)
+    'venda parcial atípica': (
+        ['Gr Liv Area', 'SalePrice'],
+        lambda df: (df['Gr Liv Area'] > 4000) & (df['SalePrice'] < 300_000)),
+}
+
+
+def inconsistent_rows(df):
+    """Máscara das linhas que violam alguma regra e a contagem por regra."""
+    mask = np.zeros(len(df), dtype=bool)
+    counts = {}
+    for name, (columns, rule) in INCONSISTENCY_RULES.items():
+        if not all(col in df.columns for col in columns):
+            continue
+        # Comparações com NA dão False: campo ausente não é inconsistência
+        violated = rule(df).fillna(False).to_numpy(dtype=bool)
+        counts[name] = int(violated.sum())
+        mask |= violated
+    return mask, counts
+
+
+class FeaturePipeline:
+    """Transformação ajustada no treino que gera a matriz de entrada do modelo.
+
+    Produz uma matriz float32 C-contígua (linhas × features), uma coluna por
+    vez, sem laços por linha nem colunas `object`:
+
+    - numéricas: conversão direta para float32, ausentes recebem a mediana do treino;
+    - categóricas: código inteiro da categoria no treino, via uma tabela de
+      consulta montada sobre as categorias do quadro (não sobre as linhas).
+      Ausentes viram 'None' nas colunas de NONE_CATEGORY_COLUMNS e a moda nas
+      demais; categorias nunca vistas ficam NaN, que o XGBoost trata como faltante.
+
+    É ajustada uma vez, salva junto com o modelo (`pipeline.json`) e usada no
+    treino, no lote e nas previsões individuais.
+    """
+
+    def __init__(self, numeric, categorical, medians, modes, categories):
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.features = self.numeric + self.categorical
+        self.medians = dict(medians)
+        self.modes = dict(modes)
+        self.categories = {col: list(cats) for col, cats in categories.items()}
+        self._codes = {col: {value: code for code, value in enumerate(cats)}
+                       for col, cats in self.categories.items()}
+        self._missing = {col: self._missing_code(col) for col in self.categorical}
+
+    def _missing_code(self, col):
+        codes = self._codes[col]
+        if col in NONE_CATEGORY_COLUMNS:
+            return codes.get(NONE_CATEGORY, np.nan)
+        return codes[self.modes[col]]
+
+    @classmethod
+    def fit(cls, train, numeric, categorical):
+        """Medianas, modas e categorias (ordenadas) aprendidas em `train`."""
+        train = fill_none_categories(train[list(numeric) + list(categorical)])
+        medians = {col: float(train[col].median()) for col in numeric}
+        modes, categories = {}, {}
+        for col in categorical:
+            counts = train[col].value_counts(dropna=True)
+            counts = counts[counts > 0]
+            counts.index = counts.index.astype(str)
+            # Desempate da moda pela ordem alfabética, como em Series.mode()
+            modes[col] = min(counts.index[counts == counts.max()])
+            categories[col] = sorted(counts.index)
+        return cls(numeric, categorical, medians, modes, categories)
+
+    def _lookup(self, col, categories):
+        # Uma entrada por categoria do quadro; a última atende os códigos -1 (ausentes)
+        codes = self._codes[col]
+        table = np.empty(len(categories) + 1, dtype=np.float32)
+        table[:-1] = [codes.get(str(value), np.nan) for value in categories]
+        table[-1] = self._missing[col]
+        return table
+
+    def _encode_categorical(self, col, series):
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = pd.Categorical(series)
+        else:
+            series = series.array
+        return self._lookup(col, series.categories)[series.codes]
+
+    def _encode_numeric(self, col, series):
+        if not pd.api.types.is_numeric_dtype(series.dtype):
+            series = pd.to_numeric(series, errors='coerce')
+        values = series.to_numpy(dtype=np.float32, na_value=np.nan)
+        return np.where(np.isnan(values), np.float32(self.medians[col]), values)
+
+    def encode_value(self, col, value):
+        """Um único campo, com o mesmo tratamento de `transform` (ausentes, categorias novas, texto)."""
+        missing = value is None or value is pd.NA or (isinstance(value, (float, np.floating)) and np.isnan(value))
+        if col in self._codes:
+            return np.float32(self._missing[col] if missing else self._codes[col].get(str(value), np.nan))
+        try:
+            number = np.float32(np.nan if missing else float(value))
+        except (TypeError, ValueError):
+            number = np.float32(np.nan)
+        return np.float32(self.medians[col]) if np.isnan(number) else number
+
+    def transform(self, df, out=None):
+        """Matriz float32 (linhas × features) numa única passada vetorizada por coluna."""
+        if out is None:
+            out = np.empty((len(df), len(self.features)), dtype=np.float32)
+        for j, col in enumerate(self.features):
+            if col in self._codes:
+                out[:, j] = self._encode_categorical(col, df[col])
+            else:
+                out[:, j] = self._encode_numeric(col, df[col])
+        return out
+
+    def to_dict(self):
+        return {'numeric': self.numeric, 'categorical': self.categorical, 'medians': self.medians,
+                'modes': self.modes, 'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(spec['numeric'], spec['categorical'], spec['medians'], spec['modes'], spec['categories'])
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,203 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+import streamlit as st
+
+from data import CACHE_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HISTORY_SIZE = 50
+METRICS_PATH = Path(os.environ.get('AMES_METRICS_PATH', CACHE_DIR / 'metrics' / 'dashboard.prom'))
+
+
+def peak_rss_bytes():
+    """Pico de memória residente do processo (None onde `resource` não existe)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def start_tracing():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_tracing():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class RerunProfiler:
+    """Tempo e alocações por seção nomeada de um rerun do script.
+
+    Desligado, `section` é um contexto vazio e o custo é desprezível. As
+    alocações vêm do `tracemalloc`, que é global ao processo: com várias
+    sessões ativas ao mesmo tempo os números incluem as outras threads.
+
+    Seções podem ser aninhadas (ex.: o filtro montado dentro de uma figura):
+    tempo e alocação líquida de cada seção são exclusivos, sem as seções
+    internas, de modo que a soma não conta nada duas vezes; o pico é o da
+    seção inteira, incluindo as internas, medido a partir do seu início.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.sections = {}
+        self.started = time.perf_counter()
+        # Seções abertas: início, memória inicial, pico visto e totais das seções internas
+        self._stack = []
+        if enabled:
+            start_tracing()
+
+    @contextlib.contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracing = tracemalloc.is_tracing()
+        frame = {'start': 0.0, 'before': 0, 'peak': 0, 'child_seconds': 0.0, 'child_alloc': 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Guarda o pico da seção externa antes de reiniciá-lo para esta
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['before'] = frame['peak'] = current
+        self._stack.append(frame)
+        frame['start'] = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame['start']
+            self._stack.pop()
+            entry = self.sections.setdefault(name, {'seconds': 0.0, 'alloc_bytes': 0, 'peak_bytes': 0, 'calls': 0})
+            entry['seconds'] += elapsed - frame['child_seconds']
+            entry['calls'] += 1
+            alloc = 0
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                alloc = current - frame['before']
+                peak = max(frame['peak'], peak)
+                entry['alloc_bytes'] += alloc - frame['child_alloc']
+                entry['peak_bytes'] = max(entry['peak_bytes'], peak - frame['before'])
+            if self._stack:
+                parent = self._stack[-1]
+                parent['child_seconds'] += elapsed
+                parent['child_alloc'] += alloc
+                if tracing:
+                    parent['peak'] = max(parent['peak'], peak)
+
+    def finish(self):
+        return {
+            'timestamp': time.time(),
+            'total_seconds': time.perf_counter() - self.started,
+            'sections': self.sections,
+            'peak_rss_bytes': peak_rss_bytes(),
+        }
+
+
+def session_history(state, maxlen=HISTORY_SIZE):
+    """Histórico de reruns perfilados da sessão (os mais antigos saem)."""
+    if 'profiling_history' not in state:
+        state['profiling_history'] = deque(maxlen=maxlen)
+    return state['profiling_history']
+
+
+def cache_counters(caches):
+    """Acertos/falhas dos caches do processo que expõem `hits` e `misses`."""
+    counters = {}
+    for name, cache in caches.items():
+        if cache is None:
+            continue
+        hits, misses = cache.hits, cache.misses
+        total = hits + misses
+        counters[name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else None}
+    return counters
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+class MetricsStore:
+    """Totais do processo (todas as sessões) exportados no formato texto do Prometheus.
+
+    O arquivo pode ser lido pelo textfile collector do node_exporter.
+    """
+
+    def __init__(self, path=METRICS_PATH):
+        self.path = path
+        self.reruns = 0
+        self.rerun_seconds = 0.0
+        self.sections = {}
+        self.peak_rss = None
+        self._lock = threading.Lock()
+
+    def record(self, run):
+        with self._lock:
+            self.reruns += 1
+            self.rerun_seconds += run['total_seconds']
+            for name, entry in run['sections'].items():
+                total = self.sections.setdefault(name, {'seconds': 0.0, 'count': 0, 'alloc_bytes': 0})
+                total['seconds'] += entry['seconds']
+                total['count'] += entry['calls']
+                total['alloc_bytes'] += entry['alloc_bytes']
+            if run['peak_rss_bytes'] is not None:
+                self.peak_rss = run['peak_rss_bytes']
+
+    def prometheus_text(self, caches=None):
+        lines = [
+            '# HELP ames_dashboard_reruns_total Reruns perfilados do script.',
+            '# TYPE ames_dashboard_reruns_total counter',
+            f'ames_dashboard_reruns_total {self.reruns}',
+            '# HELP ames_dashboard_rerun_seconds_total Tempo total dos reruns perfilados.',
+            '# TYPE ames_dashboard_rerun_seconds_total counter',
+            f'ames_dashboard_rerun_seconds_total {self.rerun_seconds:.6f}',
+            '# HELP ames_dashboard_section_seconds Tempo por seção do script.',
+            '# TYPE ames_dashboard_section_seconds summary',
+        ]
+        with self._lock:
+            sections = sorted(self.sections.items())
+            peak_rss = self.peak_rss
+        for name, total in sections:
+            lines.append(f'ames_dashboard_section_seconds_sum{{section="{_label(name)}"}} {total["seconds"]:.6f}')
+            lines.append(f'ames_dashboard_section_seconds_count{{section="{_label(name)}"}} {total["count"]}')
+        lines += ['# HELP ames_dashboard_section_alloc_bytes_total Bytes líquidos alocados por seção (tracemalloc).',
+                  '# TYPE ames_dashboard_section_alloc_bytes_total counter']
+        for name, total in sections:
+            lines.append(f'ames_dashboard_section_alloc_bytes_total{{section="{_label(name)}"}} {total["alloc_bytes"]}')
+        if peak_rss is not None:
+            lines += ['# HELP ames_dashboard_peak_rss_bytes Pico de memória residente do processo.',
+                      '# TYPE ames_dashboard_peak_rss_bytes gauge',
+                      f'ames_dashboard_peak_rss_bytes {peak_rss}']
+        if caches:
+            lines += ['# HELP ames_dashboard_cache_requests_total Consultas aos caches por resultado.',
+                      '# TYPE ames_dashboard_cache_requests_total counter']
+            for name, counter in sorted(caches.items()):
+                lines.append(f'ames_dashboard_cache_requests_total{{cache="{_label(name)}",result="hit"}} {counter["hits"]}')
+                lines.append(f'ames_dashboard_cache_requests_total{{cache="{_label(name)}",result="miss"}} {counter["misses"]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, caches=None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        tmp.write_text(self.prometheus_text(caches), encoding='utf-8')
+        os.replace(tmp, self.path)
+        return self.path
+
+
+@st.cache_resource(show_spinner=False)
+def get_metrics_store():
+    return MetricsStore()
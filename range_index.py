@@ -0,0 +1,77 @@
+import numpy as np
+import streamlit as st
+
+
+class PriceQualityIndex:
+    """Índice ordenado para os filtros de faixa de preço e de qualidade.
+
+    As linhas ficam ordenadas por (Overall Qual, SalePrice): cada nível de
+    qualidade ocupa um bloco contíguo (tabela de offsets) e, dentro do bloco,
+    os preços estão ordenados, de modo que uma faixa de preço vira um par de
+    `np.searchsorted` por nível. O custo de uma consulta é O(níveis · log n)
+    mais o tamanho do resultado, sem varrer as colunas.
+    """
+
+    def __init__(self, prices, qualities):
+        prices = np.asarray(prices)
+        qualities = np.asarray(qualities)
+        order = np.lexsort((prices, qualities))
+        sorted_qualities = qualities[order]
+
+        self.positions = order.astype(np.intp)
+        self.prices = prices[order]
+        self.levels = np.unique(sorted_qualities)
+        # offsets[i]:offsets[i + 1] é o bloco do nível levels[i]
+        self.offsets = np.append(
+            np.searchsorted(sorted_qualities, self.levels, side='left'),
+            len(order)
+        )
+        self.n_rows = len(order)
+        self.price_min = prices.min() if self.n_rows else 0
+        self.price_max = prices.max() if self.n_rows else 0
+        self.quality_min = self.levels[0] if self.n_rows else 0
+        self.quality_max = self.levels[-1] if self.n_rows else 0
+
+    @classmethod
+    def from_frame(cls, df, price_col='SalePrice', quality_col='Overall Qual'):
+        return cls(df[price_col].to_numpy(), df[quality_col].to_numpy())
+
+    def bucket_slices(self, price_range, quality_range):
+        """Retorna os intervalos [início, fim) de `positions` que satisfazem os filtros."""
+        first = np.searchsorted(self.levels, quality_range[0], side='left')
+        last = np.searchsorted(self.levels, quality_range[1], side='right')
+        slices = []
+        for i in range(first, last):
+            start, stop = self.offsets[i], self.offsets[i + 1]
+            block = self.prices[start:stop]
+            lo = start + np.searchsorted(block, price_range[0], side='left')
+            hi = start + np.searchsorted(block, price_range[1], side='right')
+            if hi > lo:
+                slices.append((lo, hi))
+        return slices
+
+    def count(self, price_range, quality_range):
+        return int(sum(hi - lo for lo, hi in self.bucket_slices(price_range, quality_range)))
+
+    def positions_for(self, price_range, quality_range):
+        """Posições (iloc) das linhas selecionadas, em ordem de (qualidade, preço)."""
+        slices = self.bucket_slices(price_range, quality_range)
+        if len(slices) == 1:
+            lo, hi = slices[0]
+            return self.positions[lo:hi]
+        if not slices:
+            return self.positions[:0]
+        return np.concatenate([self.positions[lo:hi] for lo, hi in slices])
+
+    def select(self, df, price_range, quality_range):
+        """Aplica os filtros a `df`; sem filtro efetivo, devolve o próprio `df`."""
+        positions = self.positions_for(price_range, quality_range)
+        if len(positions) == self.n_rows:
+            return df
+        return df.take(positions)
+
+
+@st.cache_resource(show_spinner=False)
+def get_range_index(data_version, _df):
+    # Construído uma vez por versão do dataset
+    return PriceQualityIndex.from_frame(_df)
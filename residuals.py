@@ -0,0 +1,103 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import xgboost as xgb
+from sklearn.model_selection import KFold
+
+from model import MODEL_DIR, TARGET, TRAIN_ROWS
+from preprocessing import inconsistent_rows
+
+RESIDUAL_FOLDS = 5
+SPLIT_LABELS = ['Treino (fora do fold)', 'Teste']
+RESIDUAL_ARRAYS = ['actual', 'predicted', 'split', 'price_decile']
+
+
+def compute_residuals(model, df):
+    """Previsões fora do fold (treino) e do modelo final (teste), alinhadas às linhas de `df`.
+
+    Nas linhas de treino cada previsão vem de um booster que não viu a linha,
+    então os resíduos refletem o erro de generalização e não o ajuste.
+    """
+    X = model.encode(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    predicted = np.empty(len(df), dtype=np.float64)
+
+    train_rows = min(TRAIN_ROWS, len(df))
+    # Como no modelo final, registros inconsistentes não entram no ajuste (mas recebem previsão)
+    consistent = ~inconsistent_rows(df.iloc[:train_rows])[0]
+    folds = KFold(n_splits=RESIDUAL_FOLDS, shuffle=True, random_state=0)
+    for fit_idx, oof_idx in folds.split(X[:train_rows]):
+        fit_idx = fit_idx[consistent[fit_idx]]
+        regressor = xgb.XGBRegressor(tree_method='hist', **model.params)
+        regressor.fit(X[fit_idx], y[fit_idx])
+        predicted[oof_idx] = regressor.get_booster().inplace_predict(X[oof_idx])
+    predicted[train_rows:] = model.booster.inplace_predict(X[train_rows:])
+
+    split = np.zeros(len(df), dtype=np.int8)
+    split[train_rows:] = 1
+    price_decile = pd.qcut(df[TARGET].rank(method='first'), 10, labels=False).to_numpy(np.int8)
+    return {'actual': y, 'predicted': predicted, 'split': split, 'price_decile': price_decile}
+
+
+def _store_dir(model):
+    return MODEL_DIR / model.key / 'residuals'
+
+
+def save_residuals(model, arrays):
+    target = _store_dir(model)
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name in RESIDUAL_ARRAYS:
+        np.save(tmp / f'{name}.npy', arrays[name])
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def read_residuals(model):
+    target = _store_dir(model)
+    if not all((target / f'{name}.npy').exists() for name in RESIDUAL_ARRAYS):
+        return None
+    return {name: np.load(target / f'{name}.npy', mmap_mode='r') for name in RESIDUAL_ARRAYS}
+
+
+def load_or_compute(model, df):
+    arrays = read_residuals(model)
+    if arrays is None:
+        save_residuals(model, compute_residuals(model, df))
+        arrays = read_residuals(model)
+    return arrays
+
+
+@st.cache_resource(show_spinner="Calculando os resíduos do modelo...")
+def get_residuals(model_key, _model, _df):
+    # Calculado uma vez por versão do modelo; depois só lê os arrays persistidos
+    return load_or_compute(_model, _df)
+
+
+def residual_frame(arrays, positions):
+    """Resíduos (real − previsto) das linhas selecionadas pelos filtros."""
+    positions = np.sort(positions)
+    actual = arrays['actual'][positions]
+    predicted = arrays['predicted'][positions]
+    return pd.DataFrame({
+        'position': positions,
+        'residual': actual - predicted,
+        'split': pd.Categorical.from_codes(arrays['split'][positions], SPLIT_LABELS),
+        'price_decile': arrays['price_decile'][positions] + 1,
+    })
+
+
+def residual_breakdown(residuals, groups):
+    """Viés (média do resíduo), MAE e contagem por grupo."""
+    frame = pd.DataFrame({'group': groups, 'residual': residuals['residual'].to_numpy()})
+    frame['abs_error'] = frame['residual'].abs()
+    summary = frame.groupby('group', observed=True).agg(
+        count=('residual', 'size'),
+        mean_error=('residual', 'mean'),
+        mae=('abs_error', 'mean'),
+    )
+    return summary.reset_index()
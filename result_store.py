@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data import BASE_DIR, CACHE_DIR
+
+STORE_PATH = CACHE_DIR / 'results.sqlite'
+# Teto do arquivo e validade das entradas, configuráveis por variável de ambiente
+MAX_BYTES = int(os.environ.get('AMES_RESULT_STORE_MB', '512')) * 1024 * 1024
+DEFAULT_TTL = float(os.environ.get('AMES_RESULT_TTL_HOURS', '168')) * 3600
+# Muda quando o formato serializado muda: entradas antigas deixam de ser encontradas
+SCHEMA_VERSION = 2
+# Acessos mais próximos que isso não regravam a data de uso (evita uma escrita por acerto)
+TOUCH_INTERVAL = 60
+
+
+def _code_version():
+    """Hash dos módulos do app: uma mudança de código (deploy) invalida os resultados salvos."""
+    if os.environ.get('AMES_CODE_VERSION'):
+        return os.environ['AMES_CODE_VERSION']
+    digest = hashlib.sha256()
+    for path in sorted([*BASE_DIR.glob('*.py'), *BASE_DIR.glob('views/*.py')]):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def _normalize(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def content_key(namespace, *parts):
+    """Hash do namespace + entradas normalizadas (tuplas, inteiros do NumPy etc.)."""
+    payload = json.dumps([SCHEMA_VERSION, CODE_VERSION, namespace, *parts], default=_normalize,
+                         separators=(',', ':'))
+    return f'{namespace}:{hashlib.sha256(payload.encode("utf-8")).hexdigest()}'
+
+
+def _encode(value):
+    # JSON com marcas para os tipos do NumPy/pandas; nada de pickle num arquivo compartilhado
+    if isinstance(value, pd.DataFrame):
+        return {'__frame__': {'index': value.index.tolist(), 'columns': value.columns.tolist(),
+                              'data': value.to_numpy().tolist()}}
+    if isinstance(value, np.ndarray):
+        return {'__array__': {'dtype': value.dtype.str, 'data': value.tolist()}}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável no cache de resultados: {type(value).__name__}")
+
+
+def _decode(obj):
+    if '__frame__' in obj:
+        frame = obj['__frame__']
+        return pd.DataFrame(frame['data'], index=frame['index'], columns=frame['columns'])
+    if '__array__' in obj:
+        return np.array(obj['__array__']['data'], dtype=obj['__array__']['dtype'])
+    return obj
+
+
+def dumps(value):
+    return json.dumps(value, default=_encode, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    return json.loads(data, object_hook=_decode)
+
+
+class ResultStore:
+    """Cache de resultados em SQLite compartilhado por sessões e processos do host.
+
+    As chaves são endereçadas pelo conteúdo (versão do código e do dataset +
+    entradas), os valores ficam em JSON comprimido (nunca pickle: quem escreve
+    no arquivo não executa código ao ser lido) e cada entrada tem validade.
+    Quando o total passa
+    de `max_bytes`, as entradas usadas há mais tempo saem primeiro. Reinícios e
+    réplicas na mesma máquina encontram o cache já aquecido.
+    """
+
+    def __init__(self, path=STORE_PATH, max_bytes=MAX_BYTES, default_ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def _connection(self):
+        # Uma conexão por thread; WAL permite leitores concorrentes com um escritor
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_bytes(self, key):
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute("SELECT value, accessed FROM results WHERE key = ? AND expires > ?",
+                           (key, now)).fetchone()
+        self._count(row is not None)
+        if row is None:
+            return None
+        if now - row[1] > TOUCH_INTERVAL:
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return zlib.decompress(row[0])
+
+    def put_bytes(self, key, data, ttl=None):
+        value = zlib.compress(data, 6)
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO results (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                     (key, value, len(value), now + (ttl or self.default_ttl), now))
+        self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        while total > self.max_bytes:
+            # Remove em lotes as entradas usadas há mais tempo
+            rows = conn.execute("SELECT key, size FROM results ORDER BY accessed LIMIT 32").fetchall()
+            if not rows:
+                break
+            conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k, _ in rows])
+            total -= sum(size for _, size in rows)
+            with self._lock:
+                self.evictions += len(rows)
+
+    def get(self, key, loads=loads):
+        data = self.get_bytes(key)
+        return None if data is None else loads(data)
+
+    def put(self, key, value, dumps=dumps, ttl=None):
+        self.put_bytes(key, dumps(value), ttl)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, ttl=ttl)
+        return value
+
+    def stats(self):
+        conn = self._connection()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        with self._lock:
+            return {'entries': entries, 'bytes': size, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_store():
+    return ResultStore()
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data import read_dataset  # noqa: E402
+from model import MODEL_PARAMS, train_model  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def dataset():
+    return read_dataset()
+
+
+@pytest.fixture(scope='session')
+def model(dataset):
+    # Poucas árvores: os testes verificam pré-processamento e serviço, não a qualidade do modelo
+    return train_model(dataset.df, dataset.version, dict(MODEL_PARAMS, n_estimators=20))
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from aggregates import AGGREGATE_COLUMNS, RangeAggregates
+from range_index import PriceQualityIndex
+
+RANGES = [
+    ((0, 10_000_000), (0, 10)),
+    ((100_000, 200_000), (0, 10)),
+    ((0, 10_000_000), (7, 10)),
+    ((129_500, 310_000), (3, 8)),
+    ((150_000, 150_000), (5, 6)),
+]
+
+
+@pytest.fixture(scope='module')
+def aggregates(dataset):
+    return RangeAggregates(PriceQualityIndex.from_frame(dataset.df), dataset.df)
+
+
+@pytest.mark.parametrize('price_range, quality_range', RANGES)
+def test_query_matches_describe(dataset, aggregates, price_range, quality_range):
+    df = dataset.df
+    selected = df[df['SalePrice'].between(*price_range) & df['Overall Qual'].between(*quality_range)]
+    result = aggregates.query(price_range, quality_range)
+    assert result['rows'] == len(selected)
+    for col in AGGREGATE_COLUMNS:
+        described = selected[col].astype(float).describe()
+        assert result[col]['count'] == described['count']
+        np.testing.assert_allclose(result[col]['mean'], described['mean'], rtol=1e-9)
+    np.testing.assert_allclose(aggregates.median_price(price_range, quality_range),
+                               selected['SalePrice'].astype(float).describe()['50%'])
+
+
+def test_empty_range(aggregates):
+    result = aggregates.query((900_000, 1_000_000), (1, 10))
+    assert result['rows'] == 0 and np.isnan(result['SalePrice']['mean'])
+    assert np.isnan(aggregates.median_price((900_000, 1_000_000), (1, 10)))
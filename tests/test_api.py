@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from data import read_dataset
+from drift import DriftMonitor, DriftSketch
+
+LISTINGS = [
+    {'Gr Liv Area': 1500},
+    {'Gr Liv Area': 1500, 'Lot Frontage': None},
+    {'Neighborhood': 'NAmes', 'Overall Qual': 7, 'Bsmt Qual': None, 'Garage Type': None},
+]
+
+
+@pytest.fixture()
+def client(model, monkeypatch, tmp_path):
+    # Modelo pequeno dos testes e histórico de drift numa pasta temporária
+    X = model.encode(read_dataset().df.iloc[:500])
+    reference = DriftSketch.fit(model, X, model.booster.inplace_predict(X))
+    monkeypatch.setattr(api, 'load_or_train', lambda df, version, params: model)
+    monkeypatch.setattr(api, 'load_monitor', lambda model, df: DriftMonitor(reference, tmp_path))
+    with TestClient(api.app) as client:
+        yield client
+
+
+def test_single_and_batch_predictions_match(client):
+    single = [client.post('/predict', json={'listing': listing}).json()['prediction'] for listing in LISTINGS]
+    batch = client.post('/predict/batch', json={'listings': LISTINGS}).json()['predictions']
+    np.testing.assert_allclose(single, batch, rtol=1e-6)
+
+
+@pytest.mark.parametrize('path, payload, status', [
+    ('/predict', {'listing': [1, 2]}, 400),
+    ('/predict', {'listing': {'Gr Liv Area': 1500, 'Foo': 1}}, 422),
+    ('/predict/batch', {'listings': [{'Gr Liv Area': 1500}, 3]}, 400),
+    ('/predict/batch', {'listings': [{'Bar': 2}]}, 422),
+])
+def test_invalid_listings(client, path, payload, status):
+    assert client.post(path, json=payload).status_code == status
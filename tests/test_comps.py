@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from comps import BLOCK_COLUMN, COMP_FEATURES, CompsIndex
+
+
+@pytest.fixture(scope='module')
+def index(dataset):
+    return CompsIndex.build(dataset.df)
+
+
+def _query(dataset, index, k, own_prices=None):
+    df = dataset.df
+    values = df[COMP_FEATURES].to_numpy(dtype=np.float32, na_value=np.nan)
+    return index.query_batch(df[BLOCK_COLUMN].to_numpy(), values, k, own_prices)
+
+
+def test_indexed_sales_are_their_own_nearest_comp(dataset, index):
+    ids, distances, _ = _query(dataset, index, 5)
+    assert np.mean(ids[:, 0] == np.arange(len(ids))) > 0.9
+    assert np.all(np.diff(distances, axis=1) >= 0)
+
+
+def test_own_prices_exclude_the_listing_sale(dataset, index):
+    own = dataset.df['SalePrice'].to_numpy(dtype=np.float64)
+    ids, distances, prices = _query(dataset, index, 5, own)
+    assert ids.shape == (len(own), 5)
+    assert not np.any(ids == np.arange(len(own))[:, None])
+    # Os demais resultados continuam sendo os mais próximos, em ordem
+    plain_ids, _, _ = _query(dataset, index, 6)
+    kept = ids[:, 0] >= 0
+    expected = np.where(plain_ids[:, 0] == np.arange(len(own)), plain_ids[:, 1], plain_ids[:, 0])
+    assert np.mean(ids[kept, 0] == expected[kept]) > 0.95
+
+
+def test_unknown_prices_keep_exact_matches(dataset, index):
+    own = np.full(len(dataset.df), np.nan)
+    ids, _, _ = _query(dataset, index, 5, own)
+    plain_ids, _, _ = _query(dataset, index, 5)
+    np.testing.assert_array_equal(ids, plain_ids)
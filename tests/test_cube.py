@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from cube import RELATIVE_ACCURACY, MarketCube
+
+
+@pytest.fixture(scope='module')
+def cube(dataset):
+    return MarketCube.build(dataset.df)
+
+
+@pytest.mark.parametrize('by', [['Neighborhood'], ['Yr Sold'], ['Overall Qual']])
+def test_rollup_matches_pandas_within_sketch_accuracy(dataset, cube, by):
+    stats = cube.rollup('price', by).set_index(by[0]).sort_index()
+    keys = dataset.df[by[0]]
+    if by[0] == 'Neighborhood':
+        keys = keys.astype(str)
+    grouped = dataset.df['SalePrice'].groupby(keys, observed=True)
+    expected = grouped.describe().sort_index()
+    expected.index = expected.index.astype(stats.index.dtype)
+    np.testing.assert_array_equal(stats['count'], expected['count'])
+    # Contagens, somas e somas de quadrados são exatas
+    np.testing.assert_allclose(stats['mean'], expected['mean'], rtol=1e-9)
+    # Desvio populacional (0 em grupos de uma venda, onde o describe dá NaN)
+    np.testing.assert_allclose(stats['std'], grouped.std(ddof=0).sort_index(), rtol=1e-6)
+    # Quantis, mínimo e máximo saem do esboço: erro relativo de até RELATIVE_ACCURACY
+    for name, column in [('min', 'min'), ('q1', '25%'), ('median', '50%'), ('q3', '75%'), ('max', 'max')]:
+        np.testing.assert_allclose(stats[name], expected[column], rtol=RELATIVE_ACCURACY)
+
+
+def test_rollup_filters_match_pandas_counts(dataset, cube):
+    df = dataset.df
+    stats = cube.rollup('price', ['Neighborhood'], quality_range=(7, 10), years=[2008, 2009])
+    selected = df[df['Overall Qual'].between(7, 10) & df['Yr Sold'].isin([2008, 2009])]
+    assert stats['count'].sum() == len(selected)
@@ -0,0 +1,40 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+import datasets
+from datasets import DatasetRegistry
+
+
+def _fake_reader(slow_city, started, release, reads):
+    def read(path):
+        reads.append(path.stem)
+        if path.stem == slow_city:
+            started.set()
+            release.wait(5)
+        return SimpleNamespace(df=pd.DataFrame({'SalePrice': [1.0, 2.0]}), version=path.stem)
+    return read
+
+
+def test_cold_load_does_not_block_cached_cities(tmp_path, monkeypatch):
+    for city in ('Rapida', 'Lenta'):
+        (tmp_path / f'{city}.csv').write_text('SalePrice\n1\n')
+    started, release, reads = threading.Event(), threading.Event(), []
+    monkeypatch.setattr(datasets, 'read_dataset', _fake_reader('Lenta', started, release, reads))
+    registry = DatasetRegistry(cities_dir=tmp_path)
+    registry.get('Rapida')
+
+    slow = [threading.Thread(target=registry.get, args=('Lenta',)) for _ in range(2)]
+    for thread in slow:
+        thread.start()
+    assert started.wait(5)
+    begin = time.perf_counter()
+    assert registry.get('Rapida').version == 'Rapida'
+    assert time.perf_counter() - begin < 0.5
+    release.set()
+    for thread in slow:
+        thread.join(5)
+    # As duas sessões que pediram a cidade fria dividiram uma única leitura
+    assert reads.count('Lenta') == 1
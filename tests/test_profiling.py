@@ -0,0 +1,27 @@
+import time
+
+import numpy as np
+
+from profiling import RerunProfiler, stop_tracing
+
+
+def test_nested_sections_are_exclusive():
+    profiler = RerunProfiler(enabled=True)
+    try:
+        with profiler.section('figure'):
+            with profiler.section('filter'):
+                block = np.ones(4_000_000)  # ~32 MB, só na seção interna
+                time.sleep(0.05)
+            del block
+            time.sleep(0.01)
+        run = profiler.finish()
+    finally:
+        stop_tracing()
+    figure, inner = run['sections']['figure'], run['sections']['filter']
+    # O tempo da seção interna não é contado de novo na externa
+    assert inner['seconds'] >= 0.05
+    assert figure['seconds'] < 0.05
+    assert figure['seconds'] + inner['seconds'] <= run['total_seconds']
+    # O pico da externa inclui o da interna (não é apagado pelo reset_peak da interna)
+    assert inner['peak_bytes'] >= 32_000_000
+    assert figure['peak_bytes'] >= inner['peak_bytes']
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from range_index import PriceQualityIndex
+
+RANGES = [
+    ((0, 10_000_000), (0, 10)),
+    ((100_000, 200_000), (0, 10)),
+    ((0, 10_000_000), (7, 10)),
+    ((150_000, 150_000), (5, 6)),
+    ((129_500, 310_000), (3, 8)),
+    ((900_000, 1_000_000), (1, 10)),
+]
+
+
+def _mask(df, price_range, quality_range):
+    return (df['SalePrice'].between(*price_range) & df['Overall Qual'].between(*quality_range)).to_numpy()
+
+
+@pytest.mark.parametrize('price_range, quality_range', RANGES)
+def test_count_and_select_match_pandas_mask(dataset, price_range, quality_range):
+    df = dataset.df
+    index = PriceQualityIndex.from_frame(df)
+    mask = _mask(df, price_range, quality_range)
+    assert index.count(price_range, quality_range) == mask.sum()
+    selected = index.select(df, price_range, quality_range)
+    np.testing.assert_array_equal(np.sort(selected.index.to_numpy()), df.index.to_numpy()[mask])
+
+
+def test_unfiltered_select_returns_the_frame(dataset):
+    index = PriceQualityIndex.from_frame(dataset.df)
+    assert index.select(dataset.df, (index.price_min, index.price_max),
+                        (index.quality_min, index.quality_max)) is dataset.df
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from analytics import spearman_matrix
+from result_store import CODE_VERSION, ResultStore, content_key
+
+
+def test_values_round_trip_as_json(dataset, tmp_path):
+    store = ResultStore(tmp_path / 'results.sqlite')
+    matrix = spearman_matrix(dataset.df.iloc[:500])
+    metrics = {'test': {'r2': np.float64(0.85), 'rows': 586}, 'errors': np.arange(3, dtype=np.float32)}
+    store.put('m', matrix)
+    store.put('x', metrics)
+    pd.testing.assert_frame_equal(store.get('m'), matrix)
+    restored = store.get('x')
+    assert restored['test'] == {'r2': 0.85, 'rows': 586}
+    np.testing.assert_array_equal(restored['errors'], metrics['errors'])
+    assert restored['errors'].dtype == np.float32
+
+
+def test_stored_bytes_are_not_pickle(tmp_path):
+    store = ResultStore(tmp_path / 'results.sqlite')
+    store.put('k', {'a': 1})
+    assert store.get_bytes('k') == b'{"a":1}'
+
+
+def test_content_key_depends_on_code_version(monkeypatch):
+    key = content_key('metrics', 'modelo')
+    monkeypatch.setattr('result_store.CODE_VERSION', CODE_VERSION + '-novo')
+    assert content_key('metrics', 'modelo') != key
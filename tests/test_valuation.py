@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation import ListingPredictor
+
+LISTINGS = [
+    {},
+    {'Gr Liv Area': 1500},
+    {'Gr Liv Area': 1500, 'Lot Frontage': None},
+    {'Bsmt Qual': None, 'Garage Type': None, 'Neighborhood': None},
+    {'Overall Qual': float('nan'), 'Kitchen Qual': 'Gd', 'Neighborhood': 'NAmes'},
+    {'Neighborhood': 'Nunca Visto', 'Year Built': '1990', 'Garage Cars': 'dois'},
+]
+
+
+@pytest.mark.parametrize('listing', LISTINGS)
+def test_single_listing_matches_pipeline(model, listing):
+    predictor = ListingPredictor(model)
+    frame = pd.DataFrame([listing]).reindex(columns=model.features)
+    np.testing.assert_array_equal(predictor.encode(listing), model.encode(frame))
+
+
+def test_missing_none_category_is_not_the_mode(model):
+    # NA em Bsmt Qual significa "sem porão": código de 'None', não a moda do treino
+    predictor = ListingPredictor(model)
+    j = predictor.positions['Bsmt Qual']
+    assert predictor.encode({'Bsmt Qual': None})[0, j] == model.pipeline.categories['Bsmt Qual'].index('None')
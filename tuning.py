@@ -0,0 +1,219 @@
+"""Busca de hiperparâmetros do XGBoost com validação cruzada K-fold.
+
+Uso:
+    python tuning.py --strategy halving --candidates 64
+    python tuning.py --strategy random --candidates 20 --folds 5
+
+Os resultados vão para `.cache/tuning/leaderboard.jsonl` (uma linha por
+candidato avaliado em cada rodada); rodar de novo retoma de onde parou. Ao
+final, a melhor configuração é gravada em `best_params.json`, que o
+`model.py` usa para treinar o booster de produção.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import KFold
+
+from data import CACHE_DIR, read_dataset
+from model import (BEST_PARAMS_PATH, CATEGORICAL_FEATURES, MODEL_PARAMS, NUMERIC_FEATURES,
+                   PROMOTION_SOURCE, TARGET, split)
+from preprocessing import INCONSISTENCY_RULES, FeaturePipeline, inconsistent_rows
+
+TUNING_DIR = CACHE_DIR / 'tuning'
+LEADERBOARD_PATH = TUNING_DIR / 'leaderboard.jsonl'
+
+MAX_ROUNDS = 2000
+EARLY_STOPPING_ROUNDS = 50
+
+# Espaço de busca: (tipo, mínimo, máximo)
+SEARCH_SPACE = {
+    'learning_rate': ('log', 0.01, 0.2),
+    'max_depth': ('int', 3, 8),
+    'subsample': ('uniform', 0.6, 1.0),
+    'colsample_bytree': ('uniform', 0.4, 1.0),
+    'min_child_weight': ('log', 1.0, 20.0),
+    'reg_lambda': ('log', 0.1, 20.0),
+    'reg_alpha': ('log', 1e-3, 10.0),
+}
+
+
+def sample_candidates(n, seed=0):
+    """Candidatos determinísticos: a mesma semente gera a mesma lista (permite retomar)."""
+    rng = np.random.default_rng(seed)
+    # O primeiro candidato é a configuração documentada atual
+    baseline = {k: v for k, v in MODEL_PARAMS.items() if k in SEARCH_SPACE}
+    candidates = [baseline]
+    while len(candidates) < n:
+        params = {}
+        for name, (kind, low, high) in SEARCH_SPACE.items():
+            if kind == 'int':
+                params[name] = int(rng.integers(low, high + 1))
+            elif kind == 'log':
+                params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        candidates.append(params)
+    return candidates
+
+
+def candidate_id(params):
+    blob = json.dumps(params, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:12]
+
+
+def search_key(pipeline, strategy, eta, min_rounds):
+    """Identifica o que muda os escores além do candidato: pipeline, regras e a grade de rodadas."""
+    payload = {'pipeline': pipeline.to_dict(), 'consistency_rules': sorted(INCONSISTENCY_RULES),
+               'strategy': strategy, 'eta': eta, 'min_rounds': min_rounds}
+    blob = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:12]
+
+
+# Estado de cada processo do pool: matrizes de cada fold construídas uma única vez
+_FOLDS = None
+
+
+def _init_worker(X, y, fold_indices):
+    global _FOLDS
+    _FOLDS = []
+    for train_idx, valid_idx in fold_indices:
+        dtrain = xgb.QuantileDMatrix(X[train_idx], y[train_idx], nthread=1)
+        dvalid = xgb.QuantileDMatrix(X[valid_idx], y[valid_idx], ref=dtrain, nthread=1)
+        _FOLDS.append((dtrain, dvalid))
+
+
+def _evaluate(params, num_rounds):
+    native = {'objective': 'reg:squarederror', 'tree_method': 'hist', 'nthread': 1,
+              'seed': MODEL_PARAMS.get('random_state', 0), 'eval_metric': 'rmse', **params}
+    scores, iterations = [], []
+    start = time.perf_counter()
+    for dtrain, dvalid in _FOLDS:
+        booster = xgb.train(native, dtrain, num_boost_round=num_rounds,
+                            evals=[(dvalid, 'valid')],
+                            early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+        scores.append(booster.best_score)
+        iterations.append(booster.best_iteration + 1)
+    return {'rmse_mean': float(np.mean(scores)), 'rmse_std': float(np.std(scores)),
+            'best_iteration': int(np.median(iterations)), 'seconds': time.perf_counter() - start}
+
+
+def read_leaderboard(path=LEADERBOARD_PATH):
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _rungs(strategy, eta, min_rounds):
+    if strategy == 'random':
+        return [MAX_ROUNDS]
+    rungs = [min_rounds]
+    while rungs[-1] * eta < MAX_ROUNDS:
+        rungs.append(rungs[-1] * eta)
+    return rungs + [MAX_ROUNDS]
+
+
+def run_search(strategy='halving', n_candidates=32, n_folds=5, eta=3, min_rounds=100,
+               seed=0, workers=None):
+    """Executa a busca e retorna a melhor linha do leaderboard."""
+    dataset = read_dataset()
+    train, _ = split(dataset.df)
+    train = train[~inconsistent_rows(train)[0]]
+    pipeline = FeaturePipeline.fit(train, NUMERIC_FEATURES, CATEGORICAL_FEATURES)
+    X = pipeline.transform(train)
+    y = train[TARGET].to_numpy(dtype=np.float32)
+    folds = list(KFold(n_splits=n_folds, shuffle=True, random_state=seed).split(X))
+
+    TUNING_DIR.mkdir(parents=True, exist_ok=True)
+    # Só retoma linhas da mesma busca: dados, folds, semente, pipeline, regras e grade de rodadas
+    search = search_key(pipeline, strategy, eta, min_rounds)
+    resume = (dataset.version, n_folds, seed, search)
+    done = {(row['id'], row['rounds']): row for row in read_leaderboard()
+            if (row['data_version'], row['folds'], row.get('seed'), row.get('search')) == resume}
+    candidates = {candidate_id(p): p for p in sample_candidates(n_candidates, seed)}
+    survivors = list(candidates)
+    rungs = _rungs(strategy, eta, min_rounds)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(X, y, folds)) as pool, \
+            open(LEADERBOARD_PATH, 'a', encoding='utf-8') as leaderboard:
+        def record(cid, rung, rounds, result):
+            row = {'id': cid, 'rung': rung, 'rounds': rounds, 'folds': n_folds, 'seed': seed,
+                   'search': search, 'data_version': dataset.version, 'params': candidates[cid], **result}
+            leaderboard.write(json.dumps(row) + '\n')
+            leaderboard.flush()
+            print(f"[rodada {rung}] {cid} rmse={row['rmse_mean']:,.0f} "
+                  f"(±{row['rmse_std']:,.0f}) iterações={row['best_iteration']}")
+            return row
+
+        results = {}
+        for rung, rounds in enumerate(rungs):
+            previous = results
+            results = {cid: done[(cid, rounds)] for cid in survivors if (cid, rounds) in done}
+            for cid in survivors:
+                # Parou cedo na rodada anterior: mais iterações não mudam o resultado
+                prev = previous.get(cid)
+                if cid not in results and prev is not None \
+                        and prev['best_iteration'] + EARLY_STOPPING_ROUNDS < prev['rounds']:
+                    result = {k: prev[k] for k in ('rmse_mean', 'rmse_std', 'best_iteration', 'seconds')}
+                    results[cid] = record(cid, rung, rounds, result)
+            pending = {pool.submit(_evaluate, candidates[cid], rounds): cid
+                       for cid in survivors if cid not in results}
+            for future in as_completed(pending):
+                cid = pending[future]
+                results[cid] = record(cid, rung, rounds, future.result())
+            ranked = sorted(survivors, key=lambda cid: results[cid]['rmse_mean'])
+            if rung < len(rungs) - 1:
+                survivors = ranked[:max(1, math.ceil(len(ranked) / eta))]
+
+    best = results[ranked[0]]
+    return best
+
+
+def best_model_params(row):
+    """Parâmetros do XGBRegressor de produção a partir de uma linha do leaderboard."""
+    params = dict(MODEL_PARAMS)
+    params.update(row['params'])
+    params['n_estimators'] = int(row['best_iteration'])
+    return params
+
+
+def promote(row, path=BEST_PARAMS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({**best_model_params(row),
+                   PROMOTION_SOURCE: {'tool': 'tuning', 'candidate': row['id'], 'search': row.get('search')}},
+                  f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--strategy', choices=['halving', 'random'], default='halving')
+    parser.add_argument('--candidates', type=int, default=32)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--eta', type=int, default=3, help="fator de corte do successive halving")
+    parser.add_argument('--min-rounds', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="padrão: número de núcleos")
+    parser.add_argument('--no-promote', action='store_true',
+                        help="não grava best_params.json para o modelo de produção")
+    args = parser.parse_args()
+
+    best = run_search(args.strategy, args.candidates, args.folds, args.eta,
+                      args.min_rounds, args.seed, args.workers)
+    print(f"Melhor: {best['id']} rmse={best['rmse_mean']:,.0f} parâmetros={best['params']}")
+    if not args.no_promote:
+        promote(best)
+        print(f"Parâmetros de produção gravados em {BEST_PARAMS_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import threading
+
+import numpy as np
+import streamlit as st
+
+
+class ListingPredictor:
+    """Previsão de um único imóvel sem montar DataFrames.
+
+    A linha padrão (o que `FeaturePipeline.transform` dá a um campo ausente)
+    é calculada uma vez; cada thread de sessão reutiliza seu próprio buffer
+    de features, preenchido campo a campo por `FeaturePipeline.encode_value`.
+    O resultado é o mesmo de `model.encode` sobre um quadro de uma linha.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.features = model.features
+        self.positions = {col: j for j, col in enumerate(self.features)}
+        self.code_maps = {
+            col: {category: np.float32(code) for code, category in enumerate(categories)}
+            for col, categories in model.pipeline.categories.items()
+        }
+        self.defaults = np.empty((1, len(self.features)), dtype=np.float32)
+        for col, j in self.positions.items():
+            self.defaults[0, j] = self.encode_value(col, None)
+        self._local = threading.local()
+
+    def default_value(self, col):
+        # Valor inicial do formulário (a moda também nas categóricas em que NA é 'None')
+        if col in self.code_maps:
+            return self.model.pipeline.modes[col]
+        return self.model.pipeline.medians[col]
+
+    def options(self, col):
+        return self.model.pipeline.categories[col]
+
+    def encode_value(self, col, value):
+        return self.model.pipeline.encode_value(col, value)
+
+    def _buffer(self):
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = self._local.row = np.empty_like(self.defaults)
+        return row
+
+    def encode(self, values):
+        row = self._buffer()
+        np.copyto(row, self.defaults)
+        for col, value in values.items():
+            row[0, self.positions[col]] = self.encode_value(col, value)
+        return row
+
+    def predict(self, values):
+        return float(self.model.booster.inplace_predict(self.encode(values))[0])
+
+
+@st.cache_resource(show_spinner=False)
+def get_predictor(model_key, _model):
+    return ListingPredictor(_model)
@@ -0,0 +1,56 @@
+"""Páginas do dashboard, executadas sob demanda pelo app.py.
+
+Cada módulo expõe `render(ctx)`; só a página selecionada roda a cada rerun.
+"""
+from functools import cached_property
+
+import streamlit as st
+
+from model import get_model
+
+
+class PageContext:
+    """Estado do rerun compartilhado pelas páginas.
+
+    O que é caro (recorte filtrado, booster) é calculado na primeira vez que
+    uma página pede e reaproveitado no mesmo rerun e nos reruns de fragmentos.
+    """
+
+    def __init__(self, df, data_version, range_index, aggregates, summary, cube, price_range, quality_range,
+                 figure_cache, profiler):
+        self.df = df
+        self.data_version = data_version
+        self.range_index = range_index
+        self.aggregates = aggregates
+        self.summary = summary
+        self.cube = cube
+        self.price_range = price_range
+        self.quality_range = quality_range
+        self.figure_cache = figure_cache
+        self.profiler = profiler
+
+    @cached_property
+    def filtered_df(self):
+        # Busca binária no índice ordenado, sem varrer as colunas
+        with self.profiler.section('filter'):
+            return self.range_index.select(self.df, self.price_range, self.quality_range)
+
+    @cached_property
+    def model(self):
+        with self.profiler.section('model'):
+            return get_model(self.data_version, self.df)
+
+    @property
+    def model_loaded(self):
+        return 'model' in self.__dict__
+
+    def cached_figure(self, name, build, *params):
+        # Figura reaproveitada por (versão do dataset, filtros, gráfico, seleções de eixos)
+        key = (self.data_version, self.price_range, self.quality_range, name) + params
+        return self.figure_cache.get_or_build(key, build)
+
+    def plot_figure(self, name, build, *params):
+        # Busca/constrói a figura e serializa para o navegador, medido como uma seção
+        with self.profiler.section(f'figure.{name}'):
+            fig = self.cached_figure(name, build, *params)
+            st.plotly_chart(fig, width='stretch')
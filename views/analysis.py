@@ -0,0 +1,390 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from analytics import cached_cramers_v, cached_spearman
+from assets import show_image
+from charts import box_figure, box_from_stats, scatter_3d_figure, scatter_figure, with_fences
+from explain import get_contributions, global_importance, waterfall_figure
+
+# Largura das imagens em st.columns(2): tela cheia no celular, metade no desktop
+HALF_WIDTH = '(max-width: 640px) 100vw, 50vw'
+RELATIONSHIP_VIEWS = ["Área vs Preço", "Qualidade vs Preço", "Distribuição por Bairros", "Tendência por Bairro",
+                      "Mapa de Calor", "Interações Adicionais"]
+# Medidas do cubo de mercado: rótulo → (medida, estatística, título do eixo)
+CUBE_MEASURES = {
+    "Preço mediano": ('price', 'median', 'Preço Mediano (USD)'),
+    "Preço por sqft mediano": ('price_per_sqft', 'median', 'Preço Mediano por sqft (USD)'),
+    "Número de vendas": ('price', 'count', 'Vendas'),
+}
+TREND_NEIGHBORHOODS = 5
+
+
+@st.fragment
+def relationship_charts(ctx):
+    # Só o gráfico visível é construído; trocar de visualização ou de eixo
+    # reexecuta apenas este fragmento, não o script inteiro
+    view = st.radio("Visualização", RELATIONSHIP_VIEWS, horizontal=True,
+                    label_visibility='collapsed', key='relationship_view')
+
+    if view == "Área vs Preço":
+        def build_area_vs_price():
+            fig = scatter_figure(ctx.filtered_df, x='Gr Liv Area', y='SalePrice',
+                            color='Overall Qual',
+                            title="Área Habitável vs Preço de Venda",
+                            labels={'Gr Liv Area': 'Área Habitável (sqft)', 
+                                   'SalePrice': 'Preço de Venda (USD)'})
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'}
+            })
+            return fig
+
+        ctx.plot_figure('area_vs_price', build_area_vs_price)
+
+    elif view == "Qualidade vs Preço":
+        def build_quality_box():
+            fig = box_figure(ctx.filtered_df, x='Overall Qual', y='SalePrice',
+                        title="Preço por Nível de Qualidade",
+                        color_discrete_sequence=['#1e3a8a'])
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'title': 'Qualidade Geral (1-10)'},
+                'yaxis': {'title': 'Preço de Venda (USD)'}
+            })
+            return fig
+
+        ctx.plot_figure('quality_box', build_quality_box)
+
+    elif view == "Distribuição por Bairros":
+        def build_neighborhood_box():
+            # Quartis por bairro somados das células do cubo (filtros aplicados no próprio cubo)
+            stats = with_fences(ctx.cube.rollup('price', ['Neighborhood'], ctx.quality_range, ctx.price_range))
+            fig = box_from_stats(stats['Neighborhood'], stats, 'SalePrice',
+                                 title="Distribuição de Preços por Bairro", color='#ff0000')
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'title': 'Bairro'},
+                'yaxis': {'title': 'Preço de Venda (USD)'}
+            })
+            return fig
+
+        ctx.plot_figure('neighborhood_box', build_neighborhood_box)
+
+    elif view == "Tendência por Bairro":
+        col1, col2 = st.columns(2)
+        with col1:
+            label = st.radio("Medida", list(CUBE_MEASURES)[:2], horizontal=True, key='trend_measure')
+        with col2:
+            monthly = st.radio("Período", ["Ano", "Mês"], horizontal=True, key='trend_period') == "Mês"
+        # Padrão: os bairros com mais vendas no dataset inteiro
+        largest = ctx.cube.rollup('price', ['Neighborhood']).nlargest(TREND_NEIGHBORHOODS, 'count')
+        neighborhoods = st.multiselect("Bairros", options=ctx.cube.neighborhoods,
+                                       default=largest['Neighborhood'].tolist(), key='trend_neighborhoods')
+        measure, stat, axis_title = CUBE_MEASURES[label]
+
+        def build_trend():
+            by = ['Neighborhood', 'Yr Sold'] + (['Mo Sold'] if monthly else [])
+            stats = ctx.cube.rollup(measure, by, ctx.quality_range, ctx.price_range, neighborhoods=neighborhoods)
+            if monthly:
+                stats['period'] = pd.to_datetime(pd.DataFrame({'year': stats['Yr Sold'], 'month': stats['Mo Sold'],
+                                                               'day': 1}))
+            else:
+                stats['period'] = stats['Yr Sold']
+            fig = px.line(stats.sort_values('period'), x='period', y=stat, color='Neighborhood', markers=True,
+                          hover_data={'count': True}, title=f"{label} por Bairro ao Longo do Tempo")
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'title': 'Mês da Venda' if monthly else 'Ano da Venda', 'dtick': None if monthly else 1},
+                'yaxis': {'title': axis_title},
+                'legend': {'title': 'Bairro'}
+            })
+            return fig
+
+        if neighborhoods:
+            ctx.plot_figure('neighborhood_trend', build_trend, label, monthly, tuple(neighborhoods))
+            if measure == 'price_per_sqft':
+                st.caption("O preço por sqft segue o filtro de qualidade; o filtro de preço vale para as medidas de preço.")
+        else:
+            st.info("Selecione ao menos um bairro.")
+
+    elif view == "Mapa de Calor":
+        col1, col2 = st.columns(2)
+        with col1:
+            label = st.radio("Medida", list(CUBE_MEASURES), horizontal=True, key='heatmap_measure')
+        with col2:
+            columns_dim = st.radio("Colunas", ["Yr Sold", "Overall Qual"], horizontal=True, key='heatmap_columns',
+                                   format_func={'Yr Sold': "Ano da Venda", 'Overall Qual': "Qualidade"}.get)
+        measure, stat, axis_title = CUBE_MEASURES[label]
+
+        def build_heatmap():
+            stats = ctx.cube.rollup(measure, ['Neighborhood', columns_dim], ctx.quality_range, ctx.price_range)
+            grid = stats.pivot(index='Neighborhood', columns=columns_dim, values=stat)
+            fig = px.imshow(grid, aspect='auto', color_continuous_scale='Blues',
+                            labels={'x': 'Ano da Venda' if columns_dim == 'Yr Sold' else 'Qualidade Geral',
+                                    'y': 'Bairro', 'color': axis_title},
+                            title=f"{label} por Bairro")
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'type': 'category'},
+                'height': 700
+            })
+            return fig
+
+        ctx.plot_figure('neighborhood_heatmap', build_heatmap, label, columns_dim)
+
+    elif view == "Interações Adicionais":
+        # Nova aba com visualizações adicionais interativas
+        st.subheader("Exploração Interativa das Variáveis-Chave")
+
+        # Gráfico de dispersão 3D interativo
+        st.markdown("**Visualização 3D Interativa:**")
+        x_axis = st.selectbox("Eixo X", options=['Gr Liv Area', 'Total Bsmt SF', 'Year Built'], index=0, key='scatter_3d_x')
+        y_axis = st.selectbox("Eixo Y", options=['Total Bsmt SF', 'Year Built', 'Gr Liv Area'], index=1, key='scatter_3d_y')
+        z_axis = st.selectbox("Eixo Z", options=['SalePrice', 'Overall Qual', 'Full Bath'], index=0, key='scatter_3d_z')
+        color_by = st.selectbox("Colorir por", options=['Overall Qual', 'Full Bath', 'Year Built'], index=0, key='scatter_3d_color')
+
+        def build_scatter_3d():
+            fig = scatter_3d_figure(ctx.filtered_df,
+                              x=x_axis,
+                              y=y_axis,
+                              z=z_axis,
+                              color=color_by,
+                              title=f"Relação 3D: {x_axis} × {y_axis} × {z_axis}",
+                              height=600)
+            fig.update_layout({
+                'scene': {
+                    'xaxis': {'title': x_axis},
+                    'yaxis': {'title': y_axis},
+                    'zaxis': {'title': z_axis},
+                    'bgcolor': 'rgba(0,0,0,0)'
+                },
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'}
+            })
+            return fig
+
+        ctx.plot_figure('scatter_3d', build_scatter_3d, x_axis, y_axis, z_axis, color_by)
+
+
+@st.fragment
+def listing_explanation(ctx, model, contributions):
+    # Trocar o imóvel reexecuta só este trecho, não a página inteira
+    st.subheader("Explicação por Imóvel")
+    orders = ctx.df['Order'].to_numpy()
+    listing_order = st.number_input("Número do imóvel (Order)", min_value=int(orders.min()),
+                                    max_value=int(orders.max()), value=int(orders.min()), step=1)
+    matches = np.flatnonzero(orders == listing_order)
+    if not len(matches):
+        st.info("Imóvel não encontrado no dataset.")
+    else:
+        position = int(matches[0])
+
+        def build_listing_waterfall():
+            fig = waterfall_figure(contributions[position], model.features,
+                                   title=f"Composição da Previsão - Imóvel {listing_order} "
+                                         f"(preço real: ${ctx.df['SalePrice'].iloc[position]:,.0f})")
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'yaxis': {'title': 'Preço (USD)'}
+            })
+            return fig
+
+        ctx.plot_figure('listing_waterfall', build_listing_waterfall, model.key, listing_order)
+
+
+def render(ctx):
+    st.title("🔍 Análise do Dataset Ames Housing")
+    
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("Tratamento de Dados")
+        st.markdown("""
+         <h4 style="color: #ff0000;">Processamento realizado:</h4>
+        <ul style="color: #ffffff;">
+            <li><b>Valores ausentes:</b> 15 variáveis categóricas utilizavam NA como uma categoria, que foi convertido para 'None'</li>
+            <li><b>Inconsistências:</b> Remoção de registros logicamente inconsistentes</li>
+            <li><b>Imputação:</b> Mediana para numéricos, moda para categóricos</li>
+            <li><b>Seleção:</b> Redução de 81 para 36 variáveis mais relevantes (via feature importance e eliminação de variáveis muito correlacionadas entre si)</li>
+        </ul>
+        """, unsafe_allow_html=True)
+    
+    # Seção unificada de visualizações
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("Relação Entre Variáveis")
+        
+        relationship_charts(ctx)
+    
+    # Seção de correlações
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("Importância das Variáveis")
+
+        # Importância global: média de |SHAP| calculada uma vez por versão do modelo
+        model = ctx.model
+        with ctx.profiler.section('contributions'):
+            contributions = get_contributions(model.key, model, ctx.df)
+        importance_data = global_importance(contributions, model.features)
+        importance_share = dict(zip(importance_data['Feature'], importance_data['Importance']))
+
+        def build_feature_importance():
+            fig = px.bar(importance_data.head(10).sort_values('Importance', ascending=True), 
+                 x='Importance', 
+                 y='Feature', 
+                 orientation='h',
+                 color_discrete_sequence=['#1e3a8a'])
+
+            # Configuração separada do título usando update_layout
+            fig.update_layout(
+                title={
+                    'text': "<b>Importância das Variáveis no Modelo</b><br><span style='font-size:12px;color:gray'>Participação média de cada variável nas previsões do modelo (|SHAP| médio)</span>",
+                    'y':0.95,
+                    'x':0.5,
+                    'xanchor': 'center',
+                    'yanchor': 'top'
+                }
+            )
+
+            # Mantenha suas outras configurações de layout
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'title': 'Importância Relativa'},
+                'yaxis': {'title': ''}
+            })
+            return fig
+
+        ctx.plot_figure('feature_importance', build_feature_importance, model.key)
+        st.markdown(f"""
+            ## Principais Variáveis Explicativas
+            - **Overall Qual**: Avaliação geral (1-10) de materiais e acabamentos da casa ({importance_share['Overall Qual']:.0%} importância)
+            - **Gr Liv Area**: Área habitável acima do solo em sqft ({importance_share['Gr Liv Area']:.0%} importância)  
+            - **Total Bsmt SF**: Área total do porão, incluindo espaços acabados ({importance_share['Total Bsmt SF']:.0%} importância)
+            - **Year Built**: Ano original de construção da propriedade ({importance_share['Year Built']:.0%} importância)
+            - **Full Bath**: Número de banheiros completos acima do solo ({importance_share['Full Bath']:.0%} importância)
+        """)
+
+        # Explicação individual a partir das contribuições já calculadas
+        listing_explanation(ctx, model, contributions)
+
+
+
+        st.subheader("Análise de Correlações")
+        
+        # Texto explicativo
+        st.markdown("""
+        <div style="color: #ffffff; margin-bottom: 20px;">
+            <h4 style="color: #ff0000;">Métodos de Análise:</h4>
+            <ul>
+                <li><b>Correlação de Spearman:</b> Para variáveis numéricas (mede relações monotônicas)</li>
+                <li><b>V de Cramer:</b> Para variáveis categóricas (mede associação entre categorias)</li>
+            </ul>
+            <h4 style="color: #ff0000; margin-top: 15px;">Principais Observações:</h4>
+            <ul>
+                <li>Em ambos os gráficos, a última linha representa nossa variável-alvo (preço de venda)</li>
+                <li>Para análise com variáveis categóricas, o preço foi dividido em quartis</li>
+                <li>Algumas variáveis mostraram alta correlação entre si, indicando possível redundância</li>
+                <li>As correlações mais fortes ajudaram na seleção de features para o modelo</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Matrizes calculadas sobre os dados filtrados (memorizadas por estado dos filtros)
+        if len(ctx.filtered_df) < 10:
+            st.info("Selecione ao menos 10 imóveis nos filtros para calcular as correlações.")
+        else:
+            col1, col2 = st.columns(2)
+
+            with col1:
+                def build_spearman():
+                    spearman = cached_spearman(ctx.data_version, ctx.price_range, ctx.quality_range, ctx.filtered_df)
+                    fig = px.imshow(spearman, zmin=-1, zmax=1, color_continuous_scale='RdBu_r',
+                                    title="Correlação de Spearman - Variáveis Numéricas",
+                                    height=700)
+                    fig.update_layout({
+                        'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                        'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                        'font': {'color': 'white'}
+                    })
+                    return fig
+
+                ctx.plot_figure('spearman', build_spearman)
+
+            with col2:
+                def build_cramers_v():
+                    cramers_v = cached_cramers_v(ctx.data_version, ctx.price_range, ctx.quality_range, ctx.filtered_df)
+                    fig = px.imshow(cramers_v, zmin=0, zmax=1, color_continuous_scale='Reds',
+                                    title="V de Cramer - Variáveis Categóricas",
+                                    height=700)
+                    fig.update_layout({
+                        'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                        'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                        'font': {'color': 'white'}
+                    })
+                    return fig
+
+                ctx.plot_figure('cramers_v', build_cramers_v)
+
+        # Figuras do estudo original (dataset completo, sem filtros)
+        with st.expander("Figuras originais do estudo"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                with ctx.profiler.section('image.correlacao_spearman'):
+                    show_image('correlacao_spearman', alt="Matriz de correlação de Spearman",
+                               caption="Correlação de Spearman - Variáveis Numéricas", sizes=HALF_WIDTH)
+
+            with col2:
+                with ctx.profiler.section('image.v_de_cramer'):
+                    show_image('v_de_cramer', alt="Matriz de V de Cramer",
+                               caption="V de Cramer - Variáveis Categóricas", sizes=HALF_WIDTH)
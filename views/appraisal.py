@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+from comps import COMP_FEATURES, get_comps_index
+from explain import get_explainer, waterfall_figure
+from valuation import get_predictor
+
+
+@st.fragment
+def listing_form(ctx, model, predictor):
+    # Cada alteração no formulário reexecuta só este fragmento (estimativa e cascata)
+    def listing_input(col):
+        # Widget do formulário a partir do valor padrão do modelo
+        default = predictor.default_value(col)
+        if col in predictor.code_maps:
+            options = predictor.options(col)
+            return st.selectbox(col, options=options, index=options.index(default), key=f"listing_{col}")
+        return st.number_input(col, min_value=0, value=int(round(default)), step=1, key=f"listing_{col}")
+
+    main_features = ['Neighborhood', 'Overall Qual', 'Gr Liv Area', 'Total Bsmt SF',
+                     'Year Built', 'Full Bath', 'Garage Cars', 'Kitchen Qual', 'Exter Qual']
+    listing = {}
+    columns = st.columns(3)
+    for i, col in enumerate(main_features):
+        with columns[i % 3]:
+            listing[col] = listing_input(col)
+
+    with st.expander("Demais características"):
+        columns = st.columns(3)
+        other_features = [col for col in predictor.features if col not in main_features]
+        for i, col in enumerate(other_features):
+            with columns[i % 3]:
+                listing[col] = listing_input(col)
+
+    start = time.perf_counter()
+    estimate = predictor.predict(listing)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.markdown("---")
+    st.metric("Preço Estimado", f"${estimate:,.0f}")
+    st.caption(f"Tempo de previsão: {elapsed_ms:.2f} ms")
+
+    # Por que este preço? Contribuições SHAP do imóvel (cache LRU por linha codificada)
+    with ctx.profiler.section('figure.listing_explanation'):
+        explainer = get_explainer(model.key, model)
+        fig = waterfall_figure(explainer.explain(predictor.encode(listing)), model.features,
+                               title="Composição da Estimativa")
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+            'font': {'color': 'white'},
+            'yaxis': {'title': 'Preço (USD)'}
+        })
+        st.plotly_chart(fig, width='stretch')
+
+    # Vendas mais parecidas (mesmo bairro), para o avaliador conferir a estimativa
+    with ctx.profiler.section('comps'):
+        index = get_comps_index(ctx.data_version, ctx.df)
+        k = st.slider("Número de comparáveis", min_value=3, max_value=20, value=5, key="comps_k")
+        start = time.perf_counter()
+        rows, distances, prices = index.query(listing, k)
+        query_ms = (time.perf_counter() - start) * 1000
+
+    st.markdown("#### Imóveis Comparáveis")
+    st.metric("Mediana de preço dos comparáveis", f"${np.nanmedian(prices):,.0f}")
+    comparables = ctx.df.iloc[rows][['Neighborhood'] + COMP_FEATURES + ['Yr Sold', 'SalePrice']].copy()
+    comparables.insert(0, 'Distância', distances.round(2))
+    st.dataframe(comparables, hide_index=True, width='stretch')
+    st.caption(f"Busca dos {k} comparáveis: {query_ms:.2f} ms")
+
+
+def render(ctx):
+    st.title("🏡 Avaliar Imóvel")
+
+    model = ctx.model
+    predictor = get_predictor(model.key, model)
+
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+
+        st.markdown("""
+        <p style="color: #ffffff;">Os campos vêm preenchidos com a mediana (numéricos) ou a moda (categóricos)
+        dos imóveis de treino. A estimativa é atualizada a cada alteração.</p>
+        """, unsafe_allow_html=True)
+
+        listing_form(ctx, model, predictor)
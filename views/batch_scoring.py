@@ -0,0 +1,62 @@
+import streamlit as st
+
+from batch import CHUNK_ROWS, predict_csv
+from comps import DEFAULT_K, get_comps_index
+from drift import get_drift_monitor
+
+
+def render(ctx):
+    st.title("📦 Previsão em Lote")
+
+    model = ctx.model
+
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+
+        st.markdown(f"""
+        <p style="color: #ffffff;">Envie um arquivo CSV no mesmo formato do <b>AmesHousing.csv</b>. Os imóveis são
+        processados em blocos de <b>{CHUNK_ROWS:,}</b> linhas com o mesmo tratamento de dados do modelo
+        ('None' para categorias ausentes, mediana/moda para imputação) e o resultado pode ser baixado em CSV.</p>
+        """, unsafe_allow_html=True)
+
+        uploaded = st.file_uploader("Arquivo CSV", type="csv")
+        with_comps = st.checkbox(f"Incluir a mediana de preço dos {DEFAULT_K} imóveis comparáveis", key="batch_comps")
+        if uploaded is not None:
+            # Guarda o resultado na sessão para não reprocessar a cada rerun (ex.: clique no download)
+            result_key = (uploaded.file_id, model.key, with_comps)
+            if st.session_state.get('batch_result', (None,))[0] != result_key:
+                status = st.empty()
+                try:
+                    output, total = predict_csv(
+                        model, uploaded,
+                        on_chunk=lambda n: status.markdown(f"⏳ {n:,} imóveis avaliados..."),
+                        comps=get_comps_index(ctx.data_version, ctx.df) if with_comps else None,
+                        # Cada envio registra um único lote, sem misturar arquivos de outras sessões
+                        monitor=get_drift_monitor(model.key, model, ctx.df).for_batch()
+                    )
+                except ValueError as error:
+                    status.empty()
+                    st.error(str(error))
+                    st.stop()
+                status.empty()
+                st.session_state['batch_result'] = (result_key, output, total)
+
+            _, output, total = st.session_state['batch_result']
+            st.success(f"✅ {total:,} imóveis avaliados")
+            st.download_button(
+                "Baixar previsões (CSV)",
+                data=output,
+                file_name="previsoes_ames.csv",
+                mime="text/csv"
+            )
@@ -0,0 +1,60 @@
+import streamlit as st
+
+
+def render(ctx):
+    st.title("🚀 Insights Transformadores e Oportunidades")
+    
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div style="border-left: 4px solid #ff0000; padding-left: 15px; margin-bottom: 30px;">
+        <h3 style="color: #1e90ff;">O QUE APRENDEMOS: REVELAÇÕES CHAVE</h3>
+        <p style="color: #ffffff; font-size: 1.1em;">Nosso mergulho nos dados desvendou padrões cruciais que desafiam intuições convencionais:</p>
+        </div>
+        
+        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px; margin-bottom: 30px;">
+            <div style="background-color: #1e1e1e; padding: 15px; border-radius: 8px; border-top: 3px solid #1e3a8a;">
+                <h4 style="color: #ff0000; margin-top: 0;">📈 Fatores de Impacto</h4>
+                <p style="color: #ffffff;">A qualidade geral explica <b>35% da variação</b> nos preços - mais que o dobro da área habitável. Acabamentos premium (Overall Qual) agregam mais valor que metros extras: qualidade construtiva impacta 40% mais no preço que a área habitável.</p>
+            </div>
+            <div style="background-color: #1e1e1e; padding: 15px; border-radius: 8px; border-top: 3px solid #ff0000;">
+                <h4 style="color: #1e90ff; margin-top: 0;">🤖 Performance do Modelo</h4>
+                <p style="color: #ffffff;">Nosso XGBoost acerta <b>83% das variações</b> de preço, mas revela fragilidade em imóveis premium - nossa próxima fronteira a conquistar.</p>
+            </div>
+        </div>
+        
+        <div style="background-color: #1a1a1a; padding: 20px; border-radius: 8px; border: 1px solid #1e3a8a; margin-bottom: 30px;">
+        <h3 style="color: #ff0000;">🔭 VISÃO DO FUTURO: ONDE ESTAMOS INDO</h3>
+        <p style="color: #ffffff;">Estamos construindo mais que um modelo - uma plataforma que pode redefinir padrões do mercado:</p>
+        <ul style="color: #ffffff; columns: 2; column-gap: 30px;">
+            <li><b>Precisão Cirúrgica:</b> Meta de reduzir o erro para <b>US$ 12.000</b> com técnicas avançadas de ensemble</li>
+            <li><b>Expansão Estratégica:</b> Levar o modelo para 5 novas cidades em 12 meses</li>
+            <li><b>Transparência Radical:</b> Dashboard explicativo para cada previsão gerada</li>
+            <li><b>Monetização Inteligente:</b> Modelo SaaS para corretores com ROI estimado de 3x</li>
+        </ul>
+        </div>
+        
+        <div style="background-color: #0a0a0a; padding: 20px; border-radius: 8px; border: 1px solid #ff0000;">
+        <h3 style="color: #1e90ff; text-align: center;">💡 OPORTUNIDADE ÚNICA</h3>
+        <p style="color: #ffffff; text-align: center; font-size: 1.1em;">
+        <b>Este projeto comprovou que algoritmos abertos podem competir com soluções proprietárias.</b><br>
+        Com recursos adicionais, podemos não apenas igualar, mas <b>superar</b> os modelos atuais, criando um padrão mais justo para o mercado.
+        </p>
+        <p style="text-align: center; margin-top: 20px;">
+        <span style="color: #ff0000; font-weight: bold;">Próxima Parada:</span> 
+        <span style="color: #1e90ff;">Redução de 20% no erro preditivo e expansão para novos mercados</span>
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from drift import PREDICTION, PSI_ALERT, PSI_WARNING, drift_scores, get_drift_monitor
+
+# Variáveis com maior PSI exibidas na evolução temporal
+TOP_FEATURES = 8
+
+LAYOUT = {
+    'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+    'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+    'font': {'color': 'white'},
+}
+
+
+def period_scores(monitor, history, by_day):
+    """PSI por período: cada lote registrado ou os lotes de cada dia mesclados."""
+    if not by_day:
+        return [(entry['time'], entry['rows'], entry['psi']) for entry in history]
+    days = {}
+    for entry in history:
+        days.setdefault(time.strftime('%Y-%m-%d', time.localtime(entry['time'])), []).append(entry)
+    periods = []
+    for day, entries in sorted(days.items()):
+        sketch = monitor.merged(entries)
+        scores = drift_scores(monitor.reference, sketch)
+        periods.append((time.mktime(time.strptime(day, '%Y-%m-%d')), sketch.rows,
+                        {col: s['psi'] for col, s in scores.items()}))
+    return periods
+
+
+def bin_labels(reference, col, categories):
+    if col in categories:
+        return list(categories[col]) + ['Desconhecida']
+    edges = reference.edges[col]
+    if not len(edges):
+        return ['Todos']
+    return ([f'< {edges[0]:,.0f}']
+            + [f'{lo:,.0f}–{hi:,.0f}' for lo, hi in zip(edges[:-1], edges[1:])]
+            + [f'≥ {edges[-1]:,.0f}'])
+
+
+def render(ctx):
+    st.title("📡 Monitoramento de Drift")
+
+    model = ctx.model
+    monitor = get_drift_monitor(model.key, model, ctx.df)
+    history = monitor.history()
+
+    st.markdown(f"""
+    <p style="color: #ffffff;">Compara os imóveis avaliados (Previsão em Lote, API e <code>drift.py</code>) com os
+    <b>{monitor.reference.rows:,}</b> imóveis de treino do modelo, variável a variável, pelo
+    <b>PSI</b> (Population Stability Index). Acima de <b>{PSI_WARNING}</b> a distribuição mudou de forma
+    moderada; acima de <b>{PSI_ALERT}</b>, de forma significativa.</p>
+    """, unsafe_allow_html=True)
+
+    if not history:
+        st.info("Nenhum lote monitorado ainda: envie um CSV em Previsão em Lote ou use a API.")
+        return
+
+    by_day = st.radio("Período", ["Por lote", "Por dia"], horizontal=True,
+                      label_visibility='collapsed', key='drift_period') == "Por dia"
+    with ctx.profiler.section('drift.scores'):
+        periods = period_scores(monitor, history, by_day)
+        scores = pd.DataFrame([psi for _, _, psi in periods],
+                              index=pd.to_datetime([t for t, _, _ in periods], unit='s'))
+    latest = scores.iloc[-1]
+    state = (model.key, len(history), history[-1]['time'], by_day)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Lotes registrados", f"{len(history):,}")
+    with col2:
+        st.metric("Imóveis monitorados", f"{sum(entry['rows'] for entry in history):,}")
+    with col3:
+        st.metric("PSI da previsão (último período)", f"{latest[PREDICTION]:.3f}")
+    with col4:
+        st.metric(f"Variáveis com PSI > {PSI_ALERT}", f"{int((latest > PSI_ALERT).sum())}")
+
+    # Evolução das variáveis que mais se afastaram do treino (e da previsão)
+    top = list(scores.drop(columns=PREDICTION).max().nlargest(TOP_FEATURES).index) + [PREDICTION]
+
+    def build_history():
+        long = scores[top].rename_axis('time').reset_index().melt(id_vars='time', var_name='Variável',
+                                                                  value_name='PSI')
+        fig = px.line(long, x='time', y='PSI', color='Variável', markers=True,
+                      title="PSI ao Longo do Tempo")
+        fig.add_hline(y=PSI_WARNING, line_dash='dot', line_color='#1e90ff')
+        fig.add_hline(y=PSI_ALERT, line_dash='dash', line_color='#ff0000')
+        fig.update_layout({**LAYOUT, 'xaxis': {'title': ''}, 'yaxis': {'title': 'PSI'}})
+        return fig
+
+    ctx.plot_figure('drift_history', build_history, *state)
+
+    def build_latest():
+        ranked = latest.sort_values(ascending=False).rename_axis('Variável').reset_index(name='PSI')
+        ranked['Nível'] = np.select([ranked['PSI'] > PSI_ALERT, ranked['PSI'] > PSI_WARNING],
+                                    ['Significativo', 'Moderado'], 'Estável')
+        fig = px.bar(ranked, x='Variável', y='PSI', color='Nível',
+                     color_discrete_map={'Estável': '#1e3a8a', 'Moderado': '#1e90ff', 'Significativo': '#ff0000'},
+                     title="PSI por Variável no Último Período")
+        fig.update_layout({**LAYOUT, 'xaxis': {'title': '', 'tickangle': -45}, 'yaxis': {'title': 'PSI'}})
+        return fig
+
+    ctx.plot_figure('drift_latest', build_latest, *state)
+
+    # Distribuição de uma variável: treino × tudo o que foi monitorado
+    col = st.selectbox("Comparar distribuição", options=[PREDICTION] + model.features, key='drift_feature')
+
+    def build_distribution():
+        current = monitor.merged(history)
+        labels = bin_labels(monitor.reference, col, model.pipeline.categories)
+        frame = pd.concat([
+            pd.DataFrame({'Faixa': labels, 'Proporção': counts / max(counts.sum(), 1), 'Conjunto': name})
+            for name, counts in [('Treino', monitor.reference.counts[col]), ('Monitorado', current.counts[col])]
+        ])
+        fig = px.bar(frame, x='Faixa', y='Proporção', color='Conjunto', barmode='group',
+                     color_discrete_sequence=['#1e3a8a', '#ff0000'], title=f"Distribuição de {col}")
+        fig.update_layout({**LAYOUT, 'xaxis': {'title': '', 'type': 'category'},
+                           'yaxis': {'title': 'Proporção', 'tickformat': '.0%'}})
+        return fig
+
+    ctx.plot_figure('drift_distribution', build_distribution, *state[:3], col)
@@ -0,0 +1,107 @@
+import streamlit as st
+
+from charts import histogram_from_counts
+
+
+def render(ctx):
+    st.title("🏠 Modelo Preditivo de Preços de Imóveis - Ames, Iowa")
+    
+    # Seção "Sobre o Projeto"
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <h3 style="color: #ff0000;">Sobre o Projeto</h3>
+        <p style="color: #ffffff;">Desenvolvemos um modelo de machine learning para prever preços de imóveis 
+        usando o dataset Ames Housing, com 2.930 propriedades e 81 características cada. Nosso objetivo é criar 
+        uma alternativa transparente aos algoritmos monopolizados que inflacionam os preços.</p>
+        
+        <h4 style="color: #ff0000; margin-top: 20px;">Contexto do Mercado</h4>
+        <p style="color: #ffffff;">Algoritmos de precificação monopolizados como o YieldStar têm contribuído para:</p>
+        <ul style="color: #ffffff;">
+            <li>Aumento médio de <b>US$ 181/mês</b> nos aluguéis</li>
+            <li><b>US$ 3.8 bilhões</b> em custos adicionais para inquilinos em 2024</li>
+        </ul>
+        
+        <h3 style="color: #ff0000; margin-top: 20px;">Nossa Solução</h3>
+        <p style="color: #ffffff;">Desenvolvemos este projeto em <b>1 semana</b> com apenas <b>1 cientista de dados</b>. 
+        Com uma equipe ampliada, poderemos:</p>
+        <ul style="color: #ffffff;">
+            <li>Reduzir o erro médio do nosso modelo atual</li>
+            <li>Desenvolver modelos para outras cidades</li>
+            <li>Criar um sistema preditivo mais justo e transparente</li>
+            <li>Gerar soluções com <b>alto retorno financeiro</b> para a equipe</li>
+        </ul>
+        
+        <h3 style="color: #ff0000; margin-top: 20px;">Explore um pouco nossa feature alvo:</h3>
+        """, unsafe_allow_html=True)
+    
+    # Métricas com dados filtrados
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("Principais Estatísticas")
+        # Somas de prefixo por faixa: sem varrer nem copiar os dados filtrados
+        stats = ctx.aggregates.query(ctx.price_range, ctx.quality_range)
+        median_price = ctx.aggregates.median_price(ctx.price_range, ctx.quality_range)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Preço Médio", f"${stats['SalePrice']['mean']:,.0f}",
+                      help=f"Mediana: ${median_price:,.0f}")
+        with col2:
+            st.metric("Área Média", f"{stats['Gr Liv Area']['mean']:,.0f} sqft")
+        with col3:
+            st.metric("Qualidade Média", f"{stats['Overall Qual']['mean']:.1f}/10")
+    
+    # Gráfico de distribuição de preços
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("Distribuição de Preços (Filtrados)")
+        def build_price_histogram():
+            # Contagens já agregadas na ingestão: só ~50 barras vão para o navegador
+            edges, counts = ctx.summary.histogram(ctx.price_range, ctx.quality_range, bins=50)
+            fig = histogram_from_counts(edges, counts, "Distribuição dos Preços de Venda", '#ff0000')
+            fig.update_layout({
+                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                'font': {'color': 'white'},
+                'xaxis': {'title': 'Preço de Venda (USD)'},
+                'yaxis': {'title': 'Número de Imóveis'}
+            })
+            return fig
+
+        ctx.plot_figure('price_histogram', build_price_histogram)
@@ -0,0 +1,189 @@
+import plotly.express as px
+import streamlit as st
+
+from assets import show_image
+from model import TRAIN_ROWS, evaluate_model
+from residuals import get_residuals, residual_breakdown, residual_frame
+
+
+def render(ctx):
+    st.title("🤖 Nosso Modelo Preditivo")
+
+    # Booster treinado uma vez por versão de dados/parâmetros e mantido em cache
+    model = ctx.model
+    with ctx.profiler.section('metrics'):
+        metrics = evaluate_model(model.key, model, ctx.df)
+    train_metrics, test_metrics = metrics['train'], metrics['test']
+    
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        
+        # Seção de Método Escolhido
+        st.markdown(f"""
+        ### ⚙️ Método: XGBoost Regressor
+        **Por que esta escolha?**
+        - Excelente desempenho com dados estruturados (como tabelas de imóveis)
+        - Resistente a overfitting com os parâmetros adequados
+        - Capacidade de capturar relações não-lineares entre features
+        - Importância automática de variáveis integrada
+        
+        **Parâmetros utilizados:**
+        - Learning Rate: {model.params['learning_rate']}
+        - Profundidade Máxima: {model.params['max_depth']}
+        - Número de Estimadores: {model.params['n_estimators']}
+        - Subamostragem: {model.params['subsample']}
+        """)
+        
+        # Seção de Performance
+        st.markdown("---")
+        st.subheader("📈 Performance do Modelo")
+        
+        # Métricas de Treino
+        st.markdown(f"#### 🔧 Métricas no Conjunto de TREINO ({TRAIN_ROWS} primeiros dados)")
+        col_train1, col_train2, col_train3 = st.columns(3)
+        with col_train1:
+            st.metric("R² Score", f"{train_metrics['r2']:.4f}")
+        with col_train2:
+            st.metric("Erro Médio Absoluto (MAE)", f"${train_metrics['mae']:,.2f}")
+        with col_train3:
+            st.metric("RMSE", f"${train_metrics['rmse']:,.2f}")
+        
+        # Métricas de Teste
+        st.markdown("#### 🧪 Métricas no Conjunto de TESTE")
+        col_test1, col_test2, col_test3 = st.columns(3)
+        with col_test1:
+            st.metric("R² Score", f"{test_metrics['r2']:.3f}")
+        with col_test2:
+            st.metric("Erro Médio Absoluto (MAE)", f"${test_metrics['mae']:,.0f}")
+        with col_test3:
+            st.metric("RMSE", f"${test_metrics['rmse']:,.0f}")
+        
+        # Gráfico de distribuição de erros
+        st.markdown("---")
+        st.subheader("📉 Distribuição dos Erros")
+
+        # Resíduos persistidos por versão do modelo (sem inferência ao reabrir a página)
+        with ctx.profiler.section('residuals'):
+            residual_store = get_residuals(model.key, model, ctx.df)
+        residuals = residual_frame(residual_store, ctx.range_index.positions_for(ctx.price_range, ctx.quality_range))
+
+        if residuals.empty:
+            st.info("Nenhum imóvel nos filtros selecionados.")
+        else:
+            def build_residual_histogram():
+                fig = px.histogram(residuals, x='residual', color='split', nbins=60,
+                                   barmode='overlay', opacity=0.7,
+                                   title="Distribuição dos Resíduos (Real − Previsto)",
+                                   color_discrete_sequence=['#1e3a8a', '#ff0000'])
+                fig.update_layout({
+                    'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                    'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                    'font': {'color': 'white'},
+                    'xaxis': {'title': 'Resíduo (USD)'},
+                    'yaxis': {'title': 'Número de Imóveis'},
+                    'legend': {'title': ''}
+                })
+                return fig
+
+            ctx.plot_figure('residual_histogram', build_residual_histogram, model.key)
+            st.caption("Resíduos positivos indicam subestimação do preço. No treino, cada previsão "
+                       "vem de um modelo que não viu o imóvel (validação cruzada).")
+
+            # Onde o modelo erra mais: viés e MAE por grupo
+            # (só o agrupamento escolhido é calculado e desenhado)
+            breakdown = st.radio("Agrupar por", ["Por Bairro", "Por Qualidade", "Por Decil de Preço"],
+                                 horizontal=True, label_visibility='collapsed', key='residual_breakdown')
+            if breakdown == "Por Bairro":
+                name, label = 'residual_by_neighborhood', 'Bairro'
+                groups = ctx.df['Neighborhood'].to_numpy()[residuals['position']]
+            elif breakdown == "Por Qualidade":
+                name, label = 'residual_by_quality', 'Qualidade Geral (1-10)'
+                groups = ctx.df['Overall Qual'].to_numpy()[residuals['position']]
+            else:
+                name, label = 'residual_by_decile', 'Decil de Preço (1 = mais baratos)'
+                groups = residuals['price_decile'].to_numpy()
+
+            def build_breakdown():
+                summary = residual_breakdown(residuals, groups)
+                fig = px.bar(summary, x='group', y='mean_error',
+                             hover_data={'mae': ':,.0f', 'count': True},
+                             title=f"Resíduo Médio por {label}",
+                             color_discrete_sequence=['#1e3a8a'])
+                fig.update_layout({
+                    'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+                    'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+                    'font': {'color': 'white'},
+                    'xaxis': {'title': label, 'type': 'category'},
+                    'yaxis': {'title': 'Resíduo Médio (USD)'}
+                })
+                return fig
+
+            ctx.plot_figure(name, build_breakdown, model.key)
+
+        # Figura do estudo original
+        with st.expander("Figura original do estudo"):
+            with ctx.profiler.section('image.distribuicao_erros'):
+                show_image('distribuicao_erros', alt="Histograma dos resíduos do estudo original",
+                           caption="Distribuição dos resíduos (erros) nos conjuntos de treino e teste")
+
+        # Nova seção de Análise de Erros (adicionada aqui)
+        st.markdown("---")
+        st.subheader("🔍 Análise dos Resultados")
+        st.markdown(f"""
+        <div style="background-color: #0a0a0a; padding: 15px; border-radius: 8px; border-left: 4px solid #1e3a8a;">
+        <h4 style="color: #1e90ff; margin-top: 0;">Principais Observações:</h4>
+        <ol style="color: #ffffff;">
+            <li><b>Erros centrados em zero</b> - Médias de ${train_metrics['mean_error']:,.2f} (treino) e ${test_metrics['mean_error']:,.2f} (teste) indicam baixo viés global</li>
+            <li><b>Padrão quase-normal com subestimação</b> - Cauda direita alongada revela dificuldade com imóveis premium</li>
+            <li><b>Bom ajuste com overfitting moderado</b> - R² de {train_metrics['r2']:.2f} (treino) vs {test_metrics['r2']:.2f} (teste)</li>
+            <li><b>Sensibilidade a outliers</b> - Disparidade entre MAE (${train_metrics['mae'] / 1000:.0f}k/${test_metrics['mae'] / 1000:.0f}k) e RMSE (${train_metrics['rmse'] / 1000:.0f}k/${test_metrics['rmse'] / 1000:.0f}k)</li>
+            <li><b>Oportunidades de melhoria</b> - Foco em regularização para propriedades de alto valor</li>
+        </ol>
+        </div>
+        """, unsafe_allow_html=True)
+        # Seção de Chamada para Ação
+        st.markdown(f"""
+        <div style="background-color: #0a0a0a; padding: 20px; border-radius: 8px; border: 1px solid #ff0000; margin-top: 20px;">
+        <h3 style="color: #ff0000; text-align: center;">🚀 <b>Vamos Juntos Melhorar Esses Resultados!</b></h3>
+        <p style="color: #ffffff; text-align: center;">
+        Com <b>{test_metrics['r2']:.0%} de acurácia</b> já comprovada, imagine o que podemos alcançar com seu talento!<br>
+        Estamos construindo um modelo <b>mais justo e transparente</b> para o mercado imobiliário.<br>
+        <b>Sua expertise</b> pode ser a peça que falta para:
+        </p>
+        <ul style="color: #ffffff; columns: 2; column-gap: 20px;">
+            <li>Reduzir o overfitting</li>
+            <li>Otimizar a precificação de imóveis premium</li>
+            <li>Melhorar a generalização</li>
+            <li>Desenvolver novas features</li>
+        </ul>
+        <p style="color: #1e90ff; text-align: center; font-weight: bold;">
+        ✨ Junte-se ao nosso time e deixe sua marca na próxima geração de modelos preditivos! ✨
+        </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown("""
+        <style>
+            div[data-testid="stContainer"] {
+                background-color: #0a0a0a;
+                border-radius: 8px;
+                padding: 25px;
+                margin: 10px 0;
+                border: 1px solid #1e3a8a;
+                box-shadow: 0 4px 8px rgba(255, 0, 0, 0.2);
+            }
+        </style>
+        """, unsafe_allow_html=True)